@@ -0,0 +1,128 @@
+"""
+Response Cache Module
+
+Small in-process TTL cache for async loaders.
+
+Authors: Balaji Rajan and Claude (Anthropic)
+License: Apache 2.0
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncTTLCache:
+    """
+    Per-key TTL cache with single-flight loading.
+
+    Concurrent misses on the same key share one in-flight load: the first
+    caller runs the loader and the rest await its outcome, success or
+    failure, so an upstream outage costs one failed call per burst rather
+    than one per queued caller. Failed loads are never cached; the last good
+    value can optionally be served stale for a bounded window while the
+    upstream is failing.
+
+    Entries live in process memory: each worker and replica keeps its own.
+    When maxsize is set, the least recently loaded entry is evicted once the
+    cache is full, which bounds memory for caller-supplied keys. In-flight
+    loads are tracked only until they finish.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        # {key: (monotonic timestamp, value)}, oldest load first
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        # {key: future of the load currently running for it}
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._maxsize = maxsize
+
+    def _fresh(self, key: str, ttl: float) -> Optional[Tuple[float, Any]]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            return entry
+        return None
+
+    def _stale_or_raise(self, key: str, stale_max_age: float, error: Exception) -> Tuple[Any, str]:
+        entry = self._fresh(key, stale_max_age)
+        if entry is None:
+            raise error
+        logger.warning("Serving stale '%s' after load failure: %s", key, error)
+        return entry[1], "STALE"
+
+    async def get_or_set(
+        self,
+        key: str,
+        ttl: float,
+        loader: Callable[[], Awaitable[Any]],
+        stale_max_age: float = 0,
+    ) -> Tuple[Any, str]:
+        """
+        Return the cached value for key, loading it on a miss.
+
+        Args:
+            key: Cache key
+            ttl: Seconds a loaded value stays fresh
+            loader: Coroutine function producing the value
+            stale_max_age: If the loader fails, seconds since the last good
+                load within which that value is returned instead of raising
+
+        Returns:
+            tuple: (value, cache status) with status "HIT", "MISS" or "STALE".
+                Only the caller that ran the loader gets "MISS"; callers
+                that awaited its in-flight load get "HIT".
+
+        Raises:
+            Exception: Whatever the loader raised, if no stale value applies
+        """
+        while True:
+            entry = self._fresh(key, ttl)
+            if entry is not None:
+                return entry[1], "HIT"
+
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            try:
+                # shield: a cancelled waiter must not cancel the shared load
+                value = await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The loading caller was cancelled; load again ourselves
+                continue
+            except Exception as e:
+                return self._stale_or_raise(key, stale_max_age, e)
+            return value, "HIT"
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved for when there are none
+            future.exception()
+            return self._stale_or_raise(key, stale_max_age, e)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._pending[key]
+
+        future.set_result(value)
+        # Re-insert so dict order tracks load time for eviction
+        self._entries.pop(key, None)
+        self._entries[key] = (time.monotonic(), value)
+        if self._maxsize is not None and len(self._entries) > self._maxsize:
+            del self._entries[next(iter(self._entries))]
+        return value, "MISS"
+
+    def clear(self, key: Optional[str] = None) -> None:
+        """Drop one key, or every entry when key is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
@@ -10,7 +10,7 @@ License: Apache 2.0
 import os
 from typing import List
 from pydantic_settings import BaseSettings
-from pydantic import Field, validator
+from pydantic import Field, field_validator, model_validator
 
 
 class Settings(BaseSettings):
@@ -44,6 +44,13 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: str = Field(default="*", env="API_CORS_ORIGINS")
 
+    # Seconds /health, /health/cluster and /health/opensearch responses are cached
+    health_cache_ttl: int = Field(default=10, env="API_HEALTH_CACHE_TTL")
+    # How long the last good health response may be served while OpenSearch is down
+    health_cache_stale_max_age: int = Field(default=60, env="API_HEALTH_CACHE_STALE_MAX_AGE")
+    # Seconds index mappings and settings responses are cached
+    index_metadata_cache_ttl: int = Field(default=120, env="API_INDEX_METADATA_CACHE_TTL")
+
     # ========================================================================
     # OpenSearch Settings
     # ========================================================================
@@ -58,6 +65,9 @@ class Settings(BaseSettings):
     # Connection pool settings
     opensearch_max_connections: int = Field(default=100, env="OPENSEARCH_MAX_CONNECTIONS")
     opensearch_timeout: int = Field(default=30, env="OPENSEARCH_TIMEOUT")
+    # gzip request bodies and ask for gzip responses; stats, mappings and
+    # large search results are JSON that compresses several-fold
+    opensearch_http_compress: bool = Field(default=True, env="OPENSEARCH_HTTP_COMPRESS")
 
     # ========================================================================
     # Security Settings
@@ -112,7 +122,8 @@ class Settings(BaseSettings):
     # Validators
     # ========================================================================
 
-    @validator("environment")
+    @field_validator("environment")
+    @classmethod
     def validate_environment(cls, v):
         """Ensure environment is valid."""
         allowed = ["development", "staging", "production", "test"]
@@ -120,14 +131,16 @@ class Settings(BaseSettings):
             raise ValueError(f"Environment must be one of: {allowed}")
         return v
 
-    @validator("opensearch_scheme")
+    @field_validator("opensearch_scheme")
+    @classmethod
     def validate_scheme(cls, v):
         """Ensure scheme is valid."""
         if v not in ["http", "https"]:
             raise ValueError("OpenSearch scheme must be 'http' or 'https'")
         return v
 
-    @validator("log_level")
+    @field_validator("log_level")
+    @classmethod
     def validate_log_level(cls, v):
         """Ensure log level is valid."""
         allowed = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -136,6 +149,12 @@ class Settings(BaseSettings):
             raise ValueError(f"Log level must be one of: {allowed}")
         return v_upper
 
+    @model_validator(mode="after")
+    def check_security(self) -> "Settings":
+        """Run the cross-field startup checks as part of model validation."""
+        validate_settings(self)
+        return self
+
     # ========================================================================
     # Configuration
     # ========================================================================
@@ -147,22 +166,20 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-# ============================================================================
-# Global Settings Instance
-# ============================================================================
-
-# Initialize settings (loads from environment + .env file)
-settings = Settings()
-
-
 # ============================================================================
 # Validation
 # ============================================================================
 
-def validate_settings():
+def validate_settings(settings: Settings):
     """
     Validate critical settings and warn about insecure configurations.
 
+    Called from ``Settings.check_security`` so the checks run exactly once,
+    inside model validation, whenever a Settings instance is built.
+
+    Args:
+        settings: Settings instance being validated
+
     Raises:
         ValueError: If critical settings are missing or invalid
     """
@@ -213,5 +230,9 @@ def validate_settings():
         raise ValueError(f"Configuration errors: {', '.join(errors)}")
 
 
-# Validate settings on import
-validate_settings()
+# ============================================================================
+# Global Settings Instance
+# ============================================================================
+
+# Initialize settings (loads from environment + .env file and validates)
+settings = Settings()
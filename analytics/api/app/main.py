@@ -7,11 +7,12 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from app.config import settings
 from app.opensearch_client import OpenSearchClient
@@ -45,11 +46,25 @@ async def lifespan(app: FastAPI):
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
     logger.info(f"Environment: {settings.environment}")
 
-    # Initialize OpenSearch client
+    # Initialize OpenSearch client once, before any request arrives. Routers
+    # reach the same pooled client through get_opensearch(), which is then a
+    # plain attribute read; aiohttp keeps its connections alive between calls.
     try:
         client = OpenSearchClient.get_client()
-        health = client.cluster.health()
-        logger.info(f"OpenSearch cluster status: {health['status']}")
+        # Independent round trips: run them concurrently. return_exceptions
+        # lets both finish, and each failure is logged on its own.
+        info, health = await asyncio.gather(
+            client.info(),
+            OpenSearchClient.health_check(client),
+            return_exceptions=True,
+        )
+        for probe, result in (("version", info), ("cluster health", health)):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to read OpenSearch {probe}: {result}")
+        if not isinstance(info, Exception):
+            logger.info(f"OpenSearch version: {info['version']['number']}")
+        if not isinstance(health, Exception):
+            logger.info(f"OpenSearch cluster status: {health['status']}")
     except Exception as e:
         logger.error(f"Failed to connect to OpenSearch: {e}")
         # Don't fail startup - let health endpoint report the issue
@@ -58,7 +73,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Analytics API")
-    OpenSearchClient.close()
+    await OpenSearchClient.close()
 
 
 # ============================================================================
@@ -73,6 +88,9 @@ app = FastAPI(
     redoc_url="/redoc",
     openapi_url="/openapi.json",
     lifespan=lifespan,
+    # orjson for every route that does not pick its own response class,
+    # e.g. index listings; search and aggregations already set it per router
+    default_response_class=ORJSONResponse,
 )
 
 # ============================================================================
@@ -82,16 +100,23 @@ app = FastAPI(
 # CORS Middleware
 # In production/staging, restrict CORS to configured origins only.
 # In development, allow all origins for convenience.
-if settings.environment in ("production", "staging") and settings.cors_origins != "*":
+CORS_ALLOW_METHODS = ("GET", "POST", "PUT", "DELETE", "OPTIONS")
+CORS_ALLOW_HEADERS = ("Authorization", "Content-Type", "Accept", "X-Request-ID")
+
+# Snapshot the settings once instead of re-reading them per branch
+cors_wildcard = settings.cors_origins == "*"
+cors_restricted = settings.environment in ("production", "staging") and not cors_wildcard
+
+if cors_restricted:
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins_list,
         allow_credentials=True,
-        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-        allow_headers=["Authorization", "Content-Type", "Accept", "X-Request-ID"],
+        allow_methods=CORS_ALLOW_METHODS,
+        allow_headers=CORS_ALLOW_HEADERS,
     )
 else:
-    if settings.cors_origins == "*":
+    if cors_wildcard:
         logger.warning(
             "CORS configured with allow_origins=['*'] and allow_credentials=True. "
             "Browsers will block credentialed cross-origin requests with wildcard origins. "
@@ -106,11 +131,11 @@ else:
     )
 
 # Rate Limiting Middleware
+# Installed only if rate limiting is enabled at startup; turning it on later
+# needs a restart. Once installed, the middleware reads the limit and the
+# enabled flag from settings per request, so it can still be switched off.
 if settings.rate_limit_enabled:
-    app.add_middleware(
-        RateLimitMiddleware,
-        requests_per_minute=settings.rate_limit_per_minute,
-    )
+    app.add_middleware(RateLimitMiddleware)
 
 # ============================================================================
 # Exception Handlers
@@ -10,12 +10,14 @@ License: Apache 2.0
 """
 
 import logging
+import time
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jose import JWTError, jwt
+from jose import ExpiredSignatureError, JWTError, jwk, jwt
 from passlib.context import CryptContext
 
 from app.config import settings
@@ -29,10 +31,33 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 bearer_scheme = HTTPBearer(auto_error=False)
 
 
+@lru_cache(maxsize=4)
+def _jwt_key(secret_key: str, algorithm: str):
+    """
+    Build the jose signing key for a secret, once per secret.
+
+    Passing a pre-constructed Key skips the per-call key parsing in
+    jwt.encode/decode. Settings are read at call time, so a changed secret
+    takes effect without re-importing this module.
+    """
+    return jwk.construct(secret_key, algorithm)
+
+
 # ============================================================================
 # User Database (in-memory for v1, backed by config)
 # ============================================================================
 
+@lru_cache(maxsize=4)
+def _hash_config_password(password: str) -> str:
+    """
+    bcrypt-hash a config-defined password, once per password.
+
+    Hashing costs hundreds of milliseconds by design; keyed on the password
+    so a changed setting is picked up without re-importing this module.
+    """
+    return pwd_context.hash(password)
+
+
 def get_users_db() -> dict:
     """
     Return the user database.
@@ -43,7 +68,7 @@ def get_users_db() -> dict:
     return {
         settings.auth_admin_username: {
             "username": settings.auth_admin_username,
-            "hashed_password": pwd_context.hash(settings.auth_admin_password),
+            "hashed_password": _hash_config_password(settings.auth_admin_password),
             "role": "admin",
             "disabled": False,
         }
@@ -65,7 +90,7 @@ def authenticate_user(username: str, password: str) -> Optional[dict]:
     user = users_db.get(username)
     if not user:
         return None
-    # For config-defined users, hash and verify each time
+    # The stored hash is cached; verifying the supplied password is not
     if not pwd_context.verify(password, user["hashed_password"]):
         return None
     return user
@@ -87,7 +112,22 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    key = _jwt_key(settings.secret_key, settings.algorithm)
+    return jwt.encode(to_encode, key, algorithm=settings.algorithm)
+
+
+@lru_cache(maxsize=4096)
+def _decode_cached(token: str, secret_key: str, algorithm: str) -> dict:
+    """
+    Verify a JWT signature and return its claims, memoized per token string.
+
+    Clients re-send the same Bearer token on every request, so repeated
+    validations become a cache lookup instead of an HMAC check and JSON parse.
+    The secret is part of the cache key so a rotated secret never accepts a
+    token verified under the old one. Expiry must still be checked by the
+    caller on every hit.
+    """
+    return jwt.decode(token, _jwt_key(secret_key, algorithm), algorithms=[algorithm])
 
 
 def decode_token(token: str) -> dict:
@@ -104,7 +144,11 @@ def decode_token(token: str) -> dict:
         HTTPException: If token is invalid or expired
     """
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = _decode_cached(token, settings.secret_key, settings.algorithm)
+        # A cached payload may have expired since it was first verified
+        exp = payload.get("exp")
+        if exp is not None and exp <= time.time():
+            raise ExpiredSignatureError("Signature has expired.")
         username = payload.get("sub")
         if username is None:
             raise HTTPException(
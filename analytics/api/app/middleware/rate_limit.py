@@ -10,7 +10,8 @@ License: Apache 2.0
 
 import logging
 import time
-from collections import defaultdict
+from collections import deque
+from typing import Deque, Dict, Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
@@ -20,6 +21,28 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Probe and scrape endpoints that are never rate limited. An exact set lookup
+# keeps the check to one hash on every request.
+_EXEMPT_PATHS = frozenset({
+    "/health",
+    "/health/",
+    "/health/readiness",
+    "/health/liveness",
+    "/health/cluster",
+    "/health/opensearch",
+    "/metrics",
+})
+
+# Request timestamps per client IP, oldest first. Module-level so that it
+# outlives middleware stack rebuilds and can be cleared with
+# reset_rate_limits().
+rate_limit_store: Dict[str, Deque[float]] = {}
+
+
+def reset_rate_limits() -> None:
+    """Forget all recorded requests, restarting every client's window."""
+    rate_limit_store.clear()
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
@@ -43,31 +66,38 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
       Redis storage) to share counters across instances.
     """
 
-    def __init__(self, app, requests_per_minute: int = 1000):
+    def __init__(self, app, requests_per_minute: Optional[int] = None):
         super().__init__(app)
+        # None follows settings.rate_limit_per_minute on every request, so
+        # the limit can change without rebuilding the middleware stack
         self.requests_per_minute = requests_per_minute
         self.window_seconds = 60
-        # {ip: [(timestamp, ...),]}
-        self._requests: dict = defaultdict(list)
+        # Encoded X-RateLimit-Limit value, re-encoded only when the limit changes
+        self._limit_header = (None, b"")
 
     async def dispatch(self, request: Request, call_next) -> Response:
         if not settings.rate_limit_enabled:
             return await call_next(request)
 
         # Skip rate limiting for health and metrics endpoints
-        if request.url.path.startswith("/health") or request.url.path == "/metrics":
+        if request.url.path in _EXEMPT_PATHS:
             return await call_next(request)
 
+        limit = self.requests_per_minute or settings.rate_limit_per_minute
         client_ip = request.client.host if request.client else "unknown"
         now = time.time()
         window_start = now - self.window_seconds
 
-        # Clean old entries and count recent requests
-        self._requests[client_ip] = [
-            t for t in self._requests[client_ip] if t > window_start
-        ]
+        bucket = rate_limit_store.get(client_ip)
+        if bucket is None:
+            bucket = deque()
+            rate_limit_store[client_ip] = bucket
+
+        # Timestamps are appended in order, so expired entries sit at the front
+        while bucket and bucket[0] <= window_start:
+            bucket.popleft()
 
-        if len(self._requests[client_ip]) >= self.requests_per_minute:
+        if len(bucket) >= limit:
             logger.warning(f"Rate limit exceeded for {client_ip}")
             return JSONResponse(
                 status_code=429,
@@ -75,17 +105,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                     "status": "error",
                     "error": {
                         "code": "RATE_LIMIT_EXCEEDED",
-                        "message": f"Rate limit exceeded. Max {self.requests_per_minute} requests per minute.",
+                        "message": f"Rate limit exceeded. Max {limit} requests per minute.",
                     },
                 },
                 headers={"Retry-After": "60"},
             )
 
-        self._requests[client_ip].append(now)
+        bucket.append(now)
+
+        if self._limit_header[0] != limit:
+            self._limit_header = (limit, str(limit).encode("latin-1"))
 
         response = await call_next(request)
-        response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(
-            self.requests_per_minute - len(self._requests[client_ip])
-        )
+        remaining = limit - len(bucket)
+        # Append both headers in one go; MutableHeaders.__setitem__ scans the
+        # header list for an existing key on every assignment.
+        response.raw_headers.extend((
+            (b"x-ratelimit-limit", self._limit_header[1]),
+            (b"x-ratelimit-remaining", str(remaining).encode("latin-1")),
+        ))
         return response
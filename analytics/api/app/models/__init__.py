@@ -18,8 +18,10 @@ from app.models.search import (
     SearchRequest,
     SearchResponse,
     SearchHit,
+    SearchAPIResponse,
     AggregationRequest,
-    AggregationResponse
+    AggregationResponse,
+    AggregationAPIResponse
 )
 
 __all__ = [
@@ -32,6 +34,8 @@ __all__ = [
     "SearchRequest",
     "SearchResponse",
     "SearchHit",
+    "SearchAPIResponse",
     "AggregationRequest",
     "AggregationResponse",
+    "AggregationAPIResponse",
 ]
@@ -8,7 +8,7 @@ License: Apache 2.0
 """
 
 from typing import Any, Optional, Generic, TypeVar
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 # Generic type for data in APIResponse
 T = TypeVar('T')
@@ -24,14 +24,16 @@ class APIResponse(BaseModel, Generic[T]):
     data: Optional[T] = Field(default=None, description="Response data")
     message: Optional[str] = Field(default=None, description="Optional message")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "status": "success",
                 "data": {"key": "value"},
                 "message": "Operation completed successfully"
             }
-        }
+        },
+    )
 
 
 class ErrorResponse(BaseModel):
@@ -43,8 +45,9 @@ class ErrorResponse(BaseModel):
     status: str = Field(default="error", description="Always 'error' for error responses")
     error: dict = Field(..., description="Error details")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "status": "error",
                 "error": {
@@ -53,7 +56,8 @@ class ErrorResponse(BaseModel):
                     "details": None
                 }
             }
-        }
+        },
+    )
 
 
 class PaginationParams(BaseModel):
@@ -68,13 +72,15 @@ class PaginationParams(BaseModel):
         """Calculate offset from page and size."""
         return (self.page - 1) * self.size
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "page": 1,
                 "size": 100
             }
-        }
+        },
+    )
 
 
 class PaginationMeta(BaseModel):
@@ -84,32 +90,43 @@ class PaginationMeta(BaseModel):
     page: int = Field(..., description="Current page number")
     size: int = Field(..., description="Items per page")
     total: int = Field(..., description="Total number of items")
-    total_pages: int = Field(..., description="Total number of pages")
-
-    class Config:
-        json_schema_extra = {
+    total_pages: Optional[int] = Field(
+        ...,
+        description="Total number of pages (null when total is a lower bound)"
+    )
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "page": 1,
                 "size": 100,
                 "total": 1523,
                 "total_pages": 16
             }
-        }
+        },
+    )
 
 
 class TimeRange(BaseModel):
     """
     Time range filter for queries.
+
+    Relative bounds rounded with date math (e.g. 'now-1h/m') resolve to the
+    same range for a whole minute, so OpenSearch can reuse cached results;
+    an unrounded 'now' changes on every request.
     """
     start: Optional[str] = Field(default=None, description="Start time (ISO 8601 or relative like 'now-1h')")
     end: Optional[str] = Field(default=None, description="End time (ISO 8601 or relative like 'now')")
     field: str = Field(default="@timestamp", description="Time field to filter on")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "start": "now-1h",
                 "end": "now",
                 "field": "@timestamp"
             }
-        }
+        },
+    )
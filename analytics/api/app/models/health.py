@@ -8,7 +8,22 @@ License: Apache 2.0
 """
 
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# OpenAPI example for cluster health, shared by both models below
+_OS_HEALTH_EXAMPLE = {
+    "cluster_name": "vaultize-opensearch-cluster",
+    "status": "green",
+    "timed_out": False,
+    "number_of_nodes": 3,
+    "number_of_data_nodes": 3,
+    "active_primary_shards": 15,
+    "active_shards": 30,
+    "relocating_shards": 0,
+    "initializing_shards": 0,
+    "unassigned_shards": 0
+}
 
 
 class OpenSearchHealthResponse(BaseModel):
@@ -26,21 +41,12 @@ class OpenSearchHealthResponse(BaseModel):
     initializing_shards: int = Field(..., description="Number of shards being initialized")
     unassigned_shards: int = Field(..., description="Number of unassigned shards")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "cluster_name": "vaultize-opensearch-cluster",
-                "status": "green",
-                "timed_out": False,
-                "number_of_nodes": 3,
-                "number_of_data_nodes": 3,
-                "active_primary_shards": 15,
-                "active_shards": 30,
-                "relocating_shards": 0,
-                "initializing_shards": 0,
-                "unassigned_shards": 0
-            }
-        }
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
+            "example": _OS_HEALTH_EXAMPLE
+        },
+    )
 
 
 class HealthResponse(BaseModel):
@@ -55,23 +61,14 @@ class HealthResponse(BaseModel):
         description="OpenSearch cluster health (if available)"
     )
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "status": "healthy",
                 "version": "0.1.0",
                 "environment": "development",
-                "opensearch": {
-                    "cluster_name": "vaultize-opensearch-cluster",
-                    "status": "green",
-                    "timed_out": False,
-                    "number_of_nodes": 3,
-                    "number_of_data_nodes": 3,
-                    "active_primary_shards": 15,
-                    "active_shards": 30,
-                    "relocating_shards": 0,
-                    "initializing_shards": 0,
-                    "unassigned_shards": 0
-                }
+                "opensearch": _OS_HEALTH_EXAMPLE
             }
-        }
+        },
+    )
@@ -7,8 +7,10 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
-from typing import Any, Dict, List, Optional
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import Any, Dict, List, Literal, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeInt, model_validator
+from pydantic.dataclasses import dataclass
 
 from app.models.common import PaginationMeta, TimeRange
 
@@ -39,10 +41,35 @@ class SearchRequest(BaseModel):
     )
     size: int = Field(default=100, ge=1, le=10000, description="Number of results to return")
     from_: int = Field(default=0, ge=0, alias="from", description="Offset for pagination")
+    track_total_hits: Optional[Union[bool, NonNegativeInt]] = Field(
+        default=None,
+        description=(
+            "How far OpenSearch counts matching documents: true for an exact "
+            "total, an integer to stop counting there, or false to skip "
+            "counting. Defaults to OpenSearch's 10,000. When the count stops "
+            "early, total is a lower bound and total_pages is null."
+        )
+    )
+
+    @model_validator(mode="before")
+    @classmethod
+    def reject_field_name_offset(cls, data: Any) -> Any:
+        """Reject "from_", which would otherwise be ignored as offset 0."""
+        if isinstance(data, dict) and "from_" in data:
+            raise ValueError('Use "from" for the pagination offset, not "from_"')
+        return data
+
+    @cached_property
+    def indices_csv(self) -> str:
+        """Comma-joined index list in the form OpenSearch expects, built once."""
+        return ",".join(self.indices)
 
-    class Config:
-        populate_by_name = True
-        json_schema_extra = {
+    # Only the "from" alias is accepted (no populate_by_name), which keeps
+    # the validator to a single key lookup for the pagination offset; a body
+    # sending the field name "from_" is rejected above instead
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "query": "level:ERROR AND service:api",
                 "indices": ["logs-2026-02-*"],
@@ -56,20 +83,18 @@ class SearchRequest(BaseModel):
                 "size": 100,
                 "from": 0
             }
-        }
-
+        },
+    )
 
-class SearchHit(BaseModel):
-    """
-    Individual search result hit.
-    """
-    index: str = Field(..., description="Index name")
-    id: str = Field(..., description="Document ID")
-    score: Optional[float] = Field(default=None, description="Relevance score")
-    source: Dict[str, Any] = Field(..., description="Document source data")
 
-    class Config:
-        json_schema_extra = {
+# Record-like results are slotted, frozen pydantic dataclasses rather than
+# BaseModels: a search can return thousands of hits, and slots drop the
+# per-instance __dict__ and fields-set bookkeeping.
+@dataclass(
+    slots=True,
+    frozen=True,
+    config=ConfigDict(
+        json_schema_extra={
             "example": {
                 "index": "logs-2026-02-04",
                 "id": "abc123",
@@ -82,7 +107,17 @@ class SearchHit(BaseModel):
                     "host": "server-01"
                 }
             }
-        }
+        },
+    ),
+)
+class SearchHit:
+    """
+    Individual search result hit.
+    """
+    index: str = Field(..., description="Index name")
+    id: str = Field(..., description="Document ID")
+    score: Optional[float] = Field(default=None, description="Relevance score")
+    source: Dict[str, Any] = Field(..., description="Document source data")
 
 
 class SearchResponse(BaseModel):
@@ -90,12 +125,16 @@ class SearchResponse(BaseModel):
     Search results response.
     """
     hits: List[SearchHit] = Field(..., description="Search result hits")
-    total: int = Field(..., description="Total number of matching documents")
+    total: int = Field(
+        ...,
+        description="Total number of matching documents (a lower bound when counting stopped early)"
+    )
     took: int = Field(..., description="Query execution time in milliseconds")
     pagination: Optional[PaginationMeta] = Field(default=None, description="Pagination metadata")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "hits": [
                     {
@@ -119,7 +158,22 @@ class SearchResponse(BaseModel):
                     "total_pages": 16
                 }
             }
-        }
+        },
+    )
+
+
+class SearchAPIResponse(BaseModel):
+    """
+    Search response envelope.
+
+    Concrete counterpart of ``APIResponse[SearchResponse]`` for the hot
+    search endpoints, avoiding a generic specialization.
+    """
+    status: str = Field(default="success", description="Response status: success or error")
+    data: SearchResponse = Field(..., description="Search results")
+    message: Optional[str] = Field(default=None, description="Optional message")
+
+    model_config = ConfigDict(defer_build=True)
 
 
 class AggregationRequest(BaseModel):
@@ -138,9 +192,9 @@ class AggregationRequest(BaseModel):
         default=None,
         description="Time range filter"
     )
-    agg_type: str = Field(
+    agg_type: Literal["terms", "date_histogram", "stats", "cardinality"] = Field(
         ...,
-        description="Aggregation type: terms, date_histogram, stats, etc."
+        description="Aggregation type: terms, date_histogram, stats, or cardinality"
     )
     field: str = Field(..., description="Field to aggregate on")
     size: Optional[int] = Field(
@@ -152,8 +206,14 @@ class AggregationRequest(BaseModel):
         description="Interval for date_histogram (e.g., '1h', '1d')"
     )
 
-    class Config:
-        json_schema_extra = {
+    @cached_property
+    def indices_csv(self) -> str:
+        """Comma-joined index list in the form OpenSearch expects, built once."""
+        return ",".join(self.indices)
+
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "query": "level:ERROR",
                 "indices": ["logs-*"],
@@ -166,10 +226,24 @@ class AggregationRequest(BaseModel):
                 "field": "service.keyword",
                 "size": 10
             }
-        }
+        },
+    )
 
 
-class AggregationBucket(BaseModel):
+@dataclass(
+    slots=True,
+    frozen=True,
+    config=ConfigDict(
+        json_schema_extra={
+            "example": {
+                "key": "api-service",
+                "doc_count": 523,
+                "data": None
+            }
+        },
+    ),
+)
+class AggregationBucket:
     """
     Single aggregation bucket result.
     """
@@ -180,15 +254,6 @@ class AggregationBucket(BaseModel):
         description="Additional aggregation data (e.g., stats)"
     )
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "key": "api-service",
-                "doc_count": 523,
-                "data": None
-            }
-        }
-
 
 class AggregationResponse(BaseModel):
     """
@@ -198,8 +263,9 @@ class AggregationResponse(BaseModel):
     total: int = Field(..., description="Total documents matched")
     took: int = Field(..., description="Query execution time in milliseconds")
 
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        defer_build=True,
+        json_schema_extra={
             "example": {
                 "buckets": [
                     {"key": "api-service", "doc_count": 523},
@@ -209,4 +275,19 @@ class AggregationResponse(BaseModel):
                 "total": 1236,
                 "took": 32
             }
-        }
+        },
+    )
+
+
+class AggregationAPIResponse(BaseModel):
+    """
+    Aggregation response envelope.
+
+    Concrete counterpart of ``APIResponse[AggregationResponse]`` for the hot
+    aggregation endpoints, avoiding a generic specialization.
+    """
+    status: str = Field(default="success", description="Response status: success or error")
+    data: AggregationResponse = Field(..., description="Aggregation results")
+    message: Optional[str] = Field(default=None, description="Optional message")
+
+    model_config = ConfigDict(defer_build=True)
@@ -9,23 +9,29 @@ License: Apache 2.0
 
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Token(BaseModel):
     """OAuth2 token response."""
+    model_config = ConfigDict(defer_build=True)
+
     access_token: str = Field(..., description="JWT access token")
     token_type: str = Field(default="bearer", description="Token type")
 
 
 class TokenData(BaseModel):
     """Decoded token data."""
+    model_config = ConfigDict(defer_build=True)
+
     username: Optional[str] = None
     role: Optional[str] = None
 
 
 class UserInfo(BaseModel):
     """User information response."""
+    model_config = ConfigDict(defer_build=True)
+
     username: str = Field(..., description="Username")
     role: str = Field(..., description="User role (admin, viewer, api_client)")
     disabled: bool = Field(default=False, description="Whether the account is disabled")
@@ -8,21 +8,88 @@ License: Apache 2.0
 """
 
 import logging
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from opensearchpy import exceptions as os_exceptions
 
-from app.models.common import APIResponse
-from app.models.search import (
-    AggregationRequest,
-    AggregationResponse,
-    AggregationBucket
-)
+from app.models.search import AggregationAPIResponse, AggregationRequest
 from app.opensearch_client import get_opensearch
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Aggregation payloads can carry thousands of buckets; orjson serializes
+# them much faster than the stdlib json encoder behind JSONResponse.
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# Aggregation body per agg_type, built as a single dict literal
+_AGG_TEMPLATES = {
+    "terms": lambda field, size, interval: {
+        "terms": {"field": field, "size": size or 10}
+    },
+    "date_histogram": lambda field, size, interval: {
+        "date_histogram": {"field": field, "fixed_interval": interval}
+    },
+    "stats": lambda field, size, interval: {"stats": {"field": field}},
+    "cardinality": lambda field, size, interval: {"cardinality": {"field": field}},
+}
+
+
+def _query_key(agg_req: AggregationRequest) -> Tuple:
+    """Flatten the request fields that shape the query body into a hashable tuple."""
+    time_range = agg_req.time_range
+    if time_range:
+        time_key = (time_range.field, time_range.start, time_range.end)
+    else:
+        time_key = (None, None, None)
+    return (agg_req.query, agg_req.agg_type, agg_req.field, agg_req.size, agg_req.interval) + time_key
+
+
+def _build_query(
+    query: Optional[str],
+    agg_type: str,
+    field: str,
+    size: Optional[int],
+    interval: Optional[str],
+    time_field: Optional[str],
+    time_start: Optional[str],
+    time_end: Optional[str],
+) -> Dict[str, Any]:
+    """Build the aggregation query DSL from the flattened request fields."""
+    # agg_type is a Literal on AggregationRequest, so unknown types are
+    # rejected with a 422 before reaching the handler
+    agg_template = _AGG_TEMPLATES[agg_type]
+    if agg_type == "date_histogram" and not interval:
+        raise ValueError("interval is required for date_histogram aggregation")
+
+    # Aggregations return no hits, so every clause goes in filter context:
+    # OpenSearch skips scoring and can cache the clauses. An empty bool
+    # matches all documents.
+    filters = []
+    if query:
+        filters.append({
+            "query_string": {
+                "query": query,
+                "default_operator": "AND"
+            }
+        })
+
+    if time_field:
+        bounds = {}
+        if time_start:
+            bounds["gte"] = time_start
+        if time_end:
+            bounds["lte"] = time_end
+        filters.append({"range": {time_field: bounds}})
+
+    return {
+        "size": 0,  # Don't return documents, only aggregations
+        "query": {"bool": {"filter": filters}},
+        "aggs": {"results": agg_template(field, size, interval)}
+    }
 
 
 def build_aggregation_query(agg_req: AggregationRequest) -> Dict[str, Any]:
@@ -34,119 +101,124 @@ def build_aggregation_query(agg_req: AggregationRequest) -> Dict[str, Any]:
 
     Returns:
         dict: OpenSearch aggregation query DSL
+
+    Raises:
+        ValueError: If a required parameter is missing
     """
-    query_body = {
-        "size": 0,  # Don't return documents, only aggregations
-        "query": {"bool": {"must": [], "filter": []}},
-        "aggs": {}
-    }
+    return _build_query(*_query_key(agg_req))
 
-    # Add filter query if provided
-    if agg_req.query:
-        query_body["query"]["bool"]["must"].append({
-            "query_string": {
-                "query": agg_req.query,
-                "default_operator": "AND"
-            }
-        })
-    else:
-        query_body["query"]["bool"]["must"].append({"match_all": {}})
-
-    # Add time range filter if provided
-    if agg_req.time_range:
-        time_filter = {"range": {}}
-        time_filter["range"][agg_req.time_range.field] = {}
-
-        if agg_req.time_range.start:
-            time_filter["range"][agg_req.time_range.field]["gte"] = agg_req.time_range.start
-        if agg_req.time_range.end:
-            time_filter["range"][agg_req.time_range.field]["lte"] = agg_req.time_range.end
-
-        query_body["query"]["bool"]["filter"].append(time_filter)
-
-    # Build aggregation based on type
-    if agg_req.agg_type == "terms":
-        query_body["aggs"]["results"] = {
-            "terms": {
-                "field": agg_req.field,
-                "size": agg_req.size or 10
-            }
-        }
-    elif agg_req.agg_type == "date_histogram":
-        if not agg_req.interval:
-            raise ValueError("interval is required for date_histogram aggregation")
-
-        query_body["aggs"]["results"] = {
-            "date_histogram": {
-                "field": agg_req.field,
-                "fixed_interval": agg_req.interval
-            }
-        }
-    elif agg_req.agg_type == "stats":
-        query_body["aggs"]["results"] = {
-            "stats": {
-                "field": agg_req.field
-            }
-        }
-    elif agg_req.agg_type == "cardinality":
-        query_body["aggs"]["results"] = {
-            "cardinality": {
-                "field": agg_req.field
-            }
+
+@lru_cache(maxsize=256)
+def _build_query_json(*query_key) -> str:
+    """
+    Build and serialize the query body, memoized per request shape.
+
+    Dashboards re-issue the same aggregations on every refresh, so repeats
+    skip both the dict construction and the client's JSON encoding: the
+    OpenSearch client sends string bodies as-is. Invalid requests raise
+    ValueError, which lru_cache does not store.
+    """
+    return orjson.dumps(_build_query(*query_key)).decode()
+
+
+def _parse_buckets(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Bucket-based aggregations (terms, date_histogram)."""
+    return [
+        {"key": bucket["key"], "doc_count": bucket["doc_count"], "data": None}
+        for bucket in results["buckets"]
+    ]
+
+
+def _parse_stats(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Stats aggregation - single result."""
+    return [{
+        "key": "stats",
+        "doc_count": results["count"],
+        "data": {
+            "min": results.get("min"),
+            "max": results.get("max"),
+            "avg": results.get("avg"),
+            "sum": results.get("sum")
         }
-    else:
-        raise ValueError(f"Unsupported aggregation type: {agg_req.agg_type}")
+    }]
+
+
+def _parse_cardinality(results: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Cardinality - unique count."""
+    return [{"key": "unique_values", "doc_count": results["value"], "data": None}]
 
-    return query_body
 
+# Response parser per agg_type, mirroring _AGG_TEMPLATES
+_AGG_PARSERS = {
+    "terms": _parse_buckets,
+    "date_histogram": _parse_buckets,
+    "stats": _parse_stats,
+    "cardinality": _parse_cardinality,
+}
 
-def parse_aggregation_response(response: Dict[str, Any], agg_type: str) -> list:
+
+def parse_aggregation_response(response: Dict[str, Any], agg_type: str) -> List[Dict[str, Any]]:
     """
     Parse OpenSearch aggregation response into buckets.
 
+    Buckets are returned as plain dicts shaped like ``AggregationBucket``.
+    The data comes straight from OpenSearch, so building validated models
+    per bucket would only add cost before serialization.
+
     Args:
         response: OpenSearch response
         agg_type: Aggregation type
 
     Returns:
-        list: List of aggregation buckets
+        list: List of aggregation bucket dicts
     """
-    buckets = []
-
-    if agg_type in ["terms", "date_histogram"]:
-        # Bucket-based aggregations
-        for bucket in response["aggregations"]["results"]["buckets"]:
-            buckets.append(AggregationBucket(
-                key=bucket["key"],
-                doc_count=bucket["doc_count"],
-                data=None
-            ))
-    elif agg_type == "stats":
-        # Stats aggregation - single result
-        stats = response["aggregations"]["results"]
-        buckets.append(AggregationBucket(
-            key="stats",
-            doc_count=stats["count"],
-            data={
-                "min": stats.get("min"),
-                "max": stats.get("max"),
-                "avg": stats.get("avg"),
-                "sum": stats.get("sum")
-            }
-        ))
-    elif agg_type == "cardinality":
-        # Cardinality - unique count
-        value = response["aggregations"]["results"]["value"]
-        buckets.append(AggregationBucket(
-            key="unique_values",
-            doc_count=value,
-            data=None
-        ))
+    return _AGG_PARSERS[agg_type](response["aggregations"]["results"])
+
+
+# Bucket aggregations larger than this are streamed in chunks rather than
+# converted and serialized in one piece
+_STREAM_BUCKET_THRESHOLD = 1000
+_STREAM_CHUNK_SIZE = 500
+
+
+async def _stream_bucket_response(raw_buckets: List[Dict[str, Any]], total: int, took: int):
+    """
+    Yield the aggregation response JSON in chunks.
 
-    return buckets
+    The full OpenSearch response and its bucket list are already in memory;
+    streaming only bounds the output side. Buckets are converted and encoded
+    _STREAM_CHUNK_SIZE at a time, so no single converted list or encoded
+    body is built for the whole result. The body is byte-for-byte what the
+    ORJSONResponse path would produce.
 
+    Args:
+        raw_buckets: Bucket list from the OpenSearch response
+        total: Total documents matched
+        took: Query execution time in milliseconds
 
-@router.post("/aggregate", response_model=APIResponse[AggregationResponse])
+    Yields:
+        bytes: Consecutive pieces of the JSON body
+    """
+    yield b'{"status":"success","data":{"buckets":['
+    for start in range(0, len(raw_buckets), _STREAM_CHUNK_SIZE):
+        chunk = [
+            {"key": bucket["key"], "doc_count": bucket["doc_count"], "data": None}
+            for bucket in raw_buckets[start:start + _STREAM_CHUNK_SIZE]
+        ]
+        if start:
+            yield b","
+        # Strip the enclosing brackets so chunks splice into one array
+        yield orjson.dumps(chunk)[1:-1]
+    yield (
+        b"],"
+        + orjson.dumps({"total": total, "took": took})[1:-1]
+        + b'},"message":'
+        + orjson.dumps(f"Aggregation completed in {took}ms")
+        + b"}"
+    )
+
+
+@router.post("/aggregate", response_model=AggregationAPIResponse)
 async def aggregate_logs(agg_req: AggregationRequest):
     """
     Perform aggregations on log data.
@@ -163,7 +235,7 @@ async def aggregate_logs(agg_req: AggregationRequest):
         agg_req: Aggregation request parameters
 
     Returns:
-        APIResponse[AggregationResponse]: Aggregation results
+        AggregationAPIResponse: Aggregation results
 
     Raises:
         HTTPException: If aggregation fails (400/500)
@@ -184,34 +256,42 @@ async def aggregate_logs(agg_req: AggregationRequest):
         ```
     """
     try:
+        # Build first so invalid requests are rejected without touching OpenSearch
+        query_body = _build_query_json(*_query_key(agg_req))
         client = get_opensearch()
-        query_body = build_aggregation_query(agg_req)
 
-        logger.info(f"Executing {agg_req.agg_type} aggregation on {agg_req.field}")
-        logger.debug(f"Query: {query_body}")
+        # Lazy %-formatting: nothing is formatted when the level is disabled
+        logger.info("Executing %s aggregation on %s", agg_req.agg_type, agg_req.field)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query: %s", query_body)
 
         # Execute aggregation
-        response = client.search(
-            index=",".join(agg_req.indices),
+        response = await client.search(
+            index=agg_req.indices_csv,
             body=query_body
         )
 
-        # Parse response
-        buckets = parse_aggregation_response(response, agg_req.agg_type)
         total = response["hits"]["total"]["value"]
         took = response["took"]
 
-        agg_response = AggregationResponse(
-            buckets=buckets,
-            total=total,
-            took=took
-        )
+        if agg_req.agg_type in ("terms", "date_histogram"):
+            raw_buckets = response["aggregations"]["results"]["buckets"]
+            if len(raw_buckets) > _STREAM_BUCKET_THRESHOLD:
+                return StreamingResponse(
+                    _stream_bucket_response(raw_buckets, total, took),
+                    media_type="application/json"
+                )
 
-        return APIResponse(
-            status="success",
-            data=agg_response,
-            message=f"Aggregation completed in {took}ms"
-        )
+        # Parse response
+        buckets = parse_aggregation_response(response, agg_req.agg_type)
+
+        # Return the response directly so FastAPI skips jsonable_encoder and
+        # response_model re-validation; response_model still documents the shape.
+        return ORJSONResponse({
+            "status": "success",
+            "data": {"buckets": buckets, "total": total, "took": took},
+            "message": f"Aggregation completed in {took}ms"
+        })
 
     except ValueError as e:
         logger.error(f"Invalid aggregation request: {e}")
@@ -239,7 +319,7 @@ async def aggregate_logs(agg_req: AggregationRequest):
         )
 
 
-@router.get("/top-values/{field}", response_model=APIResponse[AggregationResponse])
+@router.get("/top-values/{field}", response_model=AggregationAPIResponse)
 async def get_top_values(
     field: str,
     indices: str = "logs-*",
@@ -258,7 +338,7 @@ async def get_top_values(
         size: Number of top values to return
 
     Returns:
-        APIResponse[AggregationResponse]: Top values
+        AggregationAPIResponse: Top values
 
     Example:
         GET /api/v1/top-values/level.keyword?size=5
@@ -8,6 +8,7 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, HTTPException, status
@@ -42,7 +43,10 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends()):
             detail="Authentication is not enabled",
         )
 
-    user = authenticate_user(form_data.username, form_data.password)
+    # bcrypt is CPU-bound (~250ms); keep it off the event loop
+    user = await asyncio.to_thread(
+        authenticate_user, form_data.username, form_data.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
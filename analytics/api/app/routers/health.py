@@ -9,19 +9,74 @@ License: Apache 2.0
 
 import logging
 from typing import Dict, Any
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from fastapi.responses import JSONResponse
 from opensearchpy import OpenSearch, exceptions as os_exceptions
 
+from app.cache import AsyncTTLCache
 from app.config import settings
 from app.models.common import APIResponse
 from app.models.health import HealthResponse, OpenSearchHealthResponse
-from app.opensearch_client import get_opensearch
+from app.opensearch_client import OpenSearchClient, get_opensearch
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Serialized health responses, keyed per endpoint. Probes and load balancer
+# checks poll these many times a second; cache hits skip OpenSearch and
+# model serialization entirely.
+health_cache = AsyncTTLCache()
+
+
+# OpenSearchHealthResponse fields and the value used when OpenSearch omits one
+_OS_HEALTH_DEFAULTS = {
+    "cluster_name": "unknown",
+    "status": "unknown",
+    "timed_out": False,
+    "number_of_nodes": 0,
+    "number_of_data_nodes": 0,
+    "active_primary_shards": 0,
+    "active_shards": 0,
+    "relocating_shards": 0,
+    "initializing_shards": 0,
+    "unassigned_shards": 0,
+}
+
+
+def _build_os_health(health: Dict[str, Any]) -> OpenSearchHealthResponse:
+    """
+    Map a cluster health response onto OpenSearchHealthResponse.
+
+    Trusted cluster data: model_construct skips validation.
+    """
+    return OpenSearchHealthResponse.model_construct(**{
+        key: health.get(key, default) for key, default in _OS_HEALTH_DEFAULTS.items()
+    })
+
+
+async def _cached_health(key: str, load) -> Response:
+    """
+    Serve a health response from the cache, loading it on a miss.
+
+    While OpenSearch is failing, the last good response is served for up to
+    API_HEALTH_CACHE_STALE_MAX_AGE seconds, flagged as stale, so probes do
+    not flap on a transient blip.
+    """
+    body, cache_status = await health_cache.get_or_set(
+        key,
+        settings.health_cache_ttl,
+        load,
+        stale_max_age=settings.health_cache_stale_max_age,
+    )
+    headers = {
+        "Cache-Control": f"public, max-age={settings.health_cache_ttl}",
+        "X-Cache": cache_status,
+    }
+    if cache_status == "STALE":
+        headers["Warning"] = '110 - "Response is Stale"'
+    return Response(content=body, media_type="application/json", headers=headers)
+
 
 @router.get("/", response_model=HealthResponse)
 async def health_check():
@@ -33,23 +88,10 @@ async def health_check():
     Returns:
         HealthResponse: API and service health information
     """
-    try:
-        # Get OpenSearch health
-        client = get_opensearch()
-        os_health = client.cluster.health()
-
-        opensearch_health = OpenSearchHealthResponse(
-            cluster_name=os_health.get("cluster_name", "unknown"),
-            status=os_health.get("status", "unknown"),
-            timed_out=os_health.get("timed_out", False),
-            number_of_nodes=os_health.get("number_of_nodes", 0),
-            number_of_data_nodes=os_health.get("number_of_data_nodes", 0),
-            active_primary_shards=os_health.get("active_primary_shards", 0),
-            active_shards=os_health.get("active_shards", 0),
-            relocating_shards=os_health.get("relocating_shards", 0),
-            initializing_shards=os_health.get("initializing_shards", 0),
-            unassigned_shards=os_health.get("unassigned_shards", 0)
-        )
+    async def load() -> bytes:
+        os_health = await OpenSearchClient.health_check(get_opensearch())
+
+        opensearch_health = _build_os_health(os_health)
 
         # Determine overall health status
         status = "healthy"
@@ -58,12 +100,15 @@ async def health_check():
         elif os_health.get("status") == "yellow":
             status = "partially_healthy"
 
-        return HealthResponse(
+        return HealthResponse.model_construct(
             status=status,
             version=settings.app_version,
             environment=settings.environment,
             opensearch=opensearch_health
-        )
+        ).model_dump_json().encode()
+
+    try:
+        return await _cached_health("health", load)
 
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -91,8 +136,7 @@ async def readiness_check():
         HTTPException: If service is not ready (503)
     """
     try:
-        client = get_opensearch()
-        health = client.cluster.health()
+        health = await OpenSearchClient.health_check(get_opensearch())
 
         # Service is ready if OpenSearch is reachable (even if yellow)
         if health.get("status") in ["green", "yellow"]:
@@ -111,7 +155,11 @@ async def readiness_check():
         )
 
 
-@router.get("/liveness")
+# The liveness body never changes, so it is encoded once at import
+_LIVENESS_BODY = b'{"status":"alive"}'
+
+
+@router.get("/liveness", response_class=Response)
 async def liveness_check():
     """
     Kubernetes liveness probe.
@@ -119,10 +167,15 @@ async def liveness_check():
     Checks if the API process is alive and responsive.
 
     Returns:
-        dict: Liveness status
+        Response: Pre-serialized liveness status
     """
-    # Simple liveness check - if we can respond, we're alive
-    return {"status": "alive"}
+    # Simple liveness check - if we can respond, we're alive. Probes hit
+    # this every few seconds, so skip model resolution and JSON encoding.
+    return Response(
+        content=_LIVENESS_BODY,
+        media_type="application/json",
+        headers={"Cache-Control": "no-store"}
+    )
 
 
 @router.get("/cluster", response_model=APIResponse[Dict[str, Any]])
@@ -139,15 +192,16 @@ async def cluster_health():
     Raises:
         HTTPException: If unable to connect to OpenSearch (503)
     """
-    try:
-        client = get_opensearch()
-        health = client.cluster.health()
-
+    async def load() -> bytes:
+        health = await OpenSearchClient.health_check(get_opensearch())
         return APIResponse(
             status="success",
             data=health,
             message=f"Cluster status: {health.get('status', 'unknown')}"
-        )
+        ).model_dump_json().encode()
+
+    try:
+        return await _cached_health("cluster", load)
 
     except (os_exceptions.ConnectionError, Exception) as e:
         logger.error(f"Failed to get cluster health: {e}")
@@ -170,22 +224,12 @@ async def opensearch_health():
     Raises:
         HTTPException: If unable to connect to OpenSearch (503)
     """
+    async def load() -> bytes:
+        health = await OpenSearchClient.health_check(get_opensearch())
+        return _build_os_health(health).model_dump_json().encode()
+
     try:
-        client = get_opensearch()
-        health = client.cluster.health()
-
-        return OpenSearchHealthResponse(
-            cluster_name=health.get("cluster_name", "unknown"),
-            status=health.get("status", "unknown"),
-            timed_out=health.get("timed_out", False),
-            number_of_nodes=health.get("number_of_nodes", 0),
-            number_of_data_nodes=health.get("number_of_data_nodes", 0),
-            active_primary_shards=health.get("active_primary_shards", 0),
-            active_shards=health.get("active_shards", 0),
-            relocating_shards=health.get("relocating_shards", 0),
-            initializing_shards=health.get("initializing_shards", 0),
-            unassigned_shards=health.get("unassigned_shards", 0)
-        )
+        return await _cached_health("opensearch", load)
 
     except Exception as e:
         logger.error(f"Failed to get OpenSearch health: {e}")
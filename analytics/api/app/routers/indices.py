@@ -8,10 +8,13 @@ License: Apache 2.0
 """
 
 import logging
-from typing import Dict, Any, List
+import re
+from typing import Dict, Any, List, Literal, Optional
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from opensearchpy import exceptions as os_exceptions
 
+from app.cache import AsyncTTLCache
+from app.config import settings
 from app.middleware.auth import require_admin
 from app.models.common import APIResponse
 from app.opensearch_client import get_opensearch
@@ -20,6 +23,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Mappings and settings change rarely, but dashboards poll them on every
+# load. Keys are caller-supplied index names or patterns, hence the bound.
+index_metadata_cache = AsyncTTLCache(maxsize=256)
+
+# Fields kept from indices.stats; everything else is filtered out by OpenSearch
+_INDEX_STATS_FILTER_PATH = ",".join([
+    "indices.*.total.docs.count",
+    "indices.*.total.docs.deleted",
+    "indices.*.total.store.size_in_bytes",
+    "indices.*.primaries.docs.count",
+    "indices.*.primaries.store.size_in_bytes",
+])
+
+# Characters that let a delete target more than one index: wildcards, index
+# lists and whitespace, matched in a single scan
+_MULTI_INDEX_CHARS = re.compile(r"[*?,\s\[\]]").search
+
+# Columns returned by list_all_indices
+_CAT_INDICES_COLUMNS = "index,health,status,docs.count,store.size"
+
 
 @router.get("/{index_name}/stats", response_model=APIResponse[Dict[str, Any]])
 async def get_index_stats(
@@ -42,31 +65,17 @@ async def get_index_stats(
     try:
         client = get_opensearch()
 
-        # Get index stats
-        stats = client.indices.stats(index=index_name)
-
-        # Extract useful information
-        indices_stats = {}
-        for idx, idx_stats in stats.get("indices", {}).items():
-            indices_stats[idx] = {
-                "total": {
-                    "docs": {
-                        "count": idx_stats["total"]["docs"]["count"],
-                        "deleted": idx_stats["total"]["docs"]["deleted"]
-                    },
-                    "store": {
-                        "size_in_bytes": idx_stats["total"]["store"]["size_in_bytes"]
-                    }
-                },
-                "primaries": {
-                    "docs": {
-                        "count": idx_stats["primaries"]["docs"]["count"]
-                    },
-                    "store": {
-                        "size_in_bytes": idx_stats["primaries"]["store"]["size_in_bytes"]
-                    }
-                }
-            }
+        # Ask OpenSearch for only the fields we return. The full stats
+        # response carries per-index merge, translog, segment and search
+        # counters; filter_path trims it server-side, so wide patterns like
+        # logs-* no longer ship megabytes that are thrown away here.
+        stats = await client.indices.stats(
+            index=index_name,
+            metric="docs,store",
+            level="indices",
+            filter_path=_INDEX_STATS_FILTER_PATH
+        )
+        indices_stats = stats.get("indices", {})
 
         return APIResponse(
             status="success",
@@ -106,10 +115,11 @@ async def get_index_mappings(
         GET /api/v1/indices/logs-2026-02-04/mappings
     """
     try:
-        client = get_opensearch()
-
-        # Get mappings
-        mappings = client.indices.get_mapping(index=index_name)
+        mappings, _ = await index_metadata_cache.get_or_set(
+            f"mappings:{index_name}",
+            settings.index_metadata_cache_ttl,
+            lambda: get_opensearch().indices.get_mapping(index=index_name)
+        )
 
         return APIResponse(
             status="success",
@@ -149,15 +159,16 @@ async def get_index_settings(
         GET /api/v1/indices/logs-2026-02-04/settings
     """
     try:
-        client = get_opensearch()
-
-        # Get settings
-        settings = client.indices.get_settings(index=index_name)
+        index_settings, _ = await index_metadata_cache.get_or_set(
+            f"settings:{index_name}",
+            settings.index_metadata_cache_ttl,
+            lambda: get_opensearch().indices.get_settings(index=index_name)
+        )
 
         return APIResponse(
             status="success",
-            data=settings,
-            message=f"Retrieved settings for {len(settings)} indices"
+            data=index_settings,
+            message=f"Retrieved settings for {len(index_settings)} indices"
         )
 
     except os_exceptions.NotFoundError:
@@ -181,7 +192,7 @@ async def delete_index(
     Delete an index.
 
     **WARNING**: This is a destructive operation and cannot be undone.
-    Wildcards are not allowed for safety.
+    Wildcards and comma-separated index lists are not allowed for safety.
 
     Args:
         index_name: Exact index name (wildcards not permitted)
@@ -195,8 +206,9 @@ async def delete_index(
     Example:
         DELETE /api/v1/indices/logs-2026-02-04
     """
-    # Safety check: don't allow wildcards
-    if "*" in index_name or "?" in index_name:
+    # Safety check: don't allow wildcards or anything else that could make
+    # one request delete more than one index
+    if _MULTI_INDEX_CHARS(index_name):
         raise HTTPException(
             status_code=400,
             detail="Wildcards not allowed in index deletion for safety. Specify exact index name."
@@ -206,10 +218,14 @@ async def delete_index(
         client = get_opensearch()
 
         # Delete index
-        response = client.indices.delete(index=index_name)
+        response = await client.indices.delete(index=index_name)
 
         logger.info(f"Deleted index: {index_name}")
 
+        # Cached entries may be keyed by patterns that matched this index,
+        # so drop all of them rather than just this name
+        index_metadata_cache.clear()
+
         return APIResponse(
             status="success",
             data=response,
@@ -232,7 +248,9 @@ async def delete_index(
 @router.get("/", response_model=APIResponse[List[Dict[str, Any]]])
 async def list_all_indices(
     pattern: str = Query(default="*", description="Index pattern"),
-    health: str = Query(default=None, description="Filter by health: green, yellow, red")
+    health: Optional[Literal["green", "yellow", "red"]] = Query(
+        default=None, description="Filter by health: green, yellow, red"
+    )
 ):
     """
     List all indices with health and stats.
@@ -252,15 +270,16 @@ async def list_all_indices(
     try:
         client = get_opensearch()
 
-        # Get index information using cat API
-        indices = client.cat.indices(index=pattern, format="json", v=True)
-
-        # Filter by health if specified
-        if health:
-            indices = [idx for idx in indices if idx.get("health") == health]
-
-        # Sort by index name
-        indices = sorted(indices, key=lambda x: x.get("index", ""))
+        # Get index information using cat API. OpenSearch sorts by name,
+        # applies the health filter and returns only the columns the
+        # dashboard shows; a None health is left out of the request.
+        indices = await client.cat.indices(
+            index=pattern,
+            format="json",
+            health=health,
+            s="index",
+            h=_CAT_INDICES_COLUMNS
+        )
 
         return APIResponse(
             status="success",
@@ -8,19 +8,24 @@ License: Apache 2.0
 """
 
 import logging
-import math
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from opensearchpy import OpenSearch, exceptions as os_exceptions
 
 from app.config import settings
-from app.models.common import APIResponse, PaginationMeta
-from app.models.search import SearchRequest, SearchResponse, SearchHit
+from app.models.common import APIResponse
+from app.models.search import SearchAPIResponse, SearchRequest
 from app.opensearch_client import get_opensearch
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Search responses can carry up to 10k hits; orjson serializes them much
+# faster than the stdlib json encoder behind JSONResponse.
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Shared by every query without a query string; never mutated
+_MATCH_ALL = {"match_all": {}}
 
 
 def build_query(search_req: SearchRequest) -> Dict[str, Any]:
@@ -33,48 +38,46 @@ def build_query(search_req: SearchRequest) -> Dict[str, Any]:
     Returns:
         dict: OpenSearch query DSL
     """
-    query_body = {"query": {"bool": {"must": [], "filter": []}}}
-
-    # Add query string if provided
+    # Clauses are built as locals and the body assembled once, rather than
+    # mutated in place through nested lookups
     if search_req.query:
-        query_body["query"]["bool"]["must"].append({
+        must = [{
             "query_string": {
                 "query": search_req.query,
                 "default_operator": "AND"
             }
-        })
+        }]
     else:
-        # Match all if no query provided
-        query_body["query"]["bool"]["must"].append({"match_all": {}})
-
-    # Add time range filter if provided
-    if search_req.time_range:
-        time_filter = {"range": {}}
-        time_filter["range"][search_req.time_range.field] = {}
-
-        if search_req.time_range.start:
-            time_filter["range"][search_req.time_range.field]["gte"] = search_req.time_range.start
-        if search_req.time_range.end:
-            time_filter["range"][search_req.time_range.field]["lte"] = search_req.time_range.end
-
-        query_body["query"]["bool"]["filter"].append(time_filter)
-
-    # Add sort
+        must = [_MATCH_ALL]
+
+    filters = []
+    time_range = search_req.time_range
+    if time_range:
+        bounds = {}
+        if time_range.start:
+            bounds["gte"] = time_range.start
+        if time_range.end:
+            bounds["lte"] = time_range.end
+        filters.append({"range": {time_range.field: bounds}})
+
+    query_body = {
+        "query": {"bool": {"must": must, "filter": filters}},
+        "from": search_req.from_,
+        "size": search_req.size,
+    }
+
+    # Sort, field filtering and hit counting are only sent when set
     if search_req.sort:
         query_body["sort"] = search_req.sort
-
-    # Add field filtering if specified
     if search_req.fields:
         query_body["_source"] = search_req.fields
-
-    # Add pagination
-    query_body["from"] = search_req.from_
-    query_body["size"] = search_req.size
+    if search_req.track_total_hits is not None:
+        query_body["track_total_hits"] = search_req.track_total_hits
 
     return query_body
 
 
-@router.post("/search", response_model=APIResponse[SearchResponse])
+@router.post("/search", response_model=SearchAPIResponse)
 async def search_logs(search_req: SearchRequest):
     """
     Search logs using Lucene query syntax.
@@ -86,7 +89,7 @@ async def search_logs(search_req: SearchRequest):
         search_req: Search request parameters
 
     Returns:
-        APIResponse[SearchResponse]: Search results with pagination
+        SearchAPIResponse: Search results with pagination
 
     Raises:
         HTTPException: If search fails (400/500)
@@ -109,51 +112,66 @@ async def search_logs(search_req: SearchRequest):
         client = get_opensearch()
         query_body = build_query(search_req)
 
-        logger.info(f"Executing search on indices: {search_req.indices}")
-        logger.debug(f"Query: {query_body}")
+        # Lazy %-formatting: the query dict repr is only built at DEBUG level
+        logger.info("Executing search on indices: %s", search_req.indices_csv)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query: %s", query_body)
 
         # Execute search
-        response = client.search(
-            index=",".join(search_req.indices),
+        response = await client.search(
+            index=search_req.indices_csv,
             body=query_body
         )
 
-        # Parse response
-        hits = []
-        for hit in response["hits"]["hits"]:
-            hits.append(SearchHit(
-                index=hit["_index"],
-                id=hit["_id"],
-                score=hit.get("_score"),
-                source=hit["_source"]
-            ))
-
-        total = response["hits"]["total"]["value"]
+        # Hits are plain dicts shaped like SearchHit. They come straight from
+        # OpenSearch, so validating up to 10k dataclasses would only add cost
+        # before serialization.
+        hits = [
+            {
+                "index": hit["_index"],
+                "id": hit["_id"],
+                "score": hit.get("_score"),
+                "source": hit["_source"]
+            }
+            for hit in response["hits"]["hits"]
+        ]
+
         took = response["took"]
 
-        # Calculate pagination
-        total_pages = math.ceil(total / search_req.size)
+        # OpenSearch stops counting at track_total_hits (10,000 by default)
+        # and reports relation "gte"; with counting disabled there is no
+        # total at all. Either way the page count is unknown.
+        total_hits = response["hits"].get("total")
+        if total_hits is None:
+            total = search_req.from_ + len(hits)
+        else:
+            total = total_hits["value"]
+
+        if total_hits is not None and total_hits.get("relation", "eq") == "eq":
+            # Ceiling division in integers; size is validated to be >= 1
+            total_pages = -(-total // search_req.size)
+        else:
+            total_pages = None
         current_page = (search_req.from_ // search_req.size) + 1
 
-        pagination = PaginationMeta(
-            page=current_page,
-            size=search_req.size,
-            total=total,
-            total_pages=total_pages
-        )
-
-        search_response = SearchResponse(
-            hits=hits,
-            total=total,
-            took=took,
-            pagination=pagination
-        )
-
-        return APIResponse(
-            status="success",
-            data=search_response,
-            message=f"Found {total} results in {took}ms"
-        )
+        # Return the response directly so FastAPI skips jsonable_encoder and
+        # response_model re-validation; response_model still documents the
+        # shape.
+        return ORJSONResponse({
+            "status": "success",
+            "data": {
+                "hits": hits,
+                "total": total,
+                "took": took,
+                "pagination": {
+                    "page": current_page,
+                    "size": search_req.size,
+                    "total": total,
+                    "total_pages": total_pages
+                }
+            },
+            "message": f"Found {total} results in {took}ms"
+        })
 
     except os_exceptions.RequestError as e:
         logger.error(f"Invalid search query: {e}")
@@ -175,7 +193,7 @@ async def search_logs(search_req: SearchRequest):
         )
 
 
-@router.get("/search/simple", response_model=APIResponse[SearchResponse])
+@router.get("/search/simple", response_model=SearchAPIResponse)
 async def simple_search(
     q: str = Query(..., description="Search query string"),
     indices: str = Query(default="logs-*", description="Comma-separated index patterns"),
@@ -195,7 +213,7 @@ async def simple_search(
         from_: Offset for pagination
 
     Returns:
-        APIResponse[SearchResponse]: Search results
+        SearchAPIResponse: Search results
 
     Example:
         GET /api/v1/search/simple?q=level:ERROR&indices=logs-*&size=50
@@ -205,7 +223,7 @@ async def simple_search(
         query=q,
         indices=indices.split(","),
         size=size,
-        from_=from_
+        **{"from": from_}
     )
 
     # Use the main search function
@@ -237,7 +255,7 @@ async def count_documents(
 
         body = {"query": {"query_string": {"query": q, "default_operator": "AND"}}}
 
-        response = client.count(
+        response = await client.count(
             index=indices,
             body=body,
         )
@@ -5,14 +5,196 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+import os
+
+# Drop the *_created series from /metrics scrapes. prometheus_client reads
+# this when it is first imported, so it must be set before the app import.
+os.environ.setdefault("PROMETHEUS_DISABLE_CREATED_SERIES", "True")
+
 import pytest
-from typing import Generator, Dict, Any
-from unittest.mock import Mock, MagicMock
+from types import MappingProxyType, SimpleNamespace
+from typing import Generator, Any, Mapping
+from unittest.mock import AsyncMock
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.config import Settings
+from app.middleware.auth import pwd_context
+from app.middleware.rate_limit import reset_rate_limits
+from app.opensearch_client import OpenSearchClient
+from app.routers.health import health_cache
+from app.routers.indices import index_metadata_cache
+
+
+# ============================================================================
+# Sample Payloads
+# ============================================================================
+# Built once per session. Fixtures hand these out directly, so tests must
+# treat them as read-only; the sample_* payloads are wrapped in
+# MappingProxyType so a top-level write fails loudly.
+
+_MOCK_CLUSTER_HEALTH = {
+    "cluster_name": "test-cluster",
+    "status": "green",
+    "number_of_nodes": 3,
+    "active_shards": 10
+}
+
+_MOCK_SEARCH_RESPONSE = {
+    "took": 5,
+    "hits": {
+        "total": {"value": 100, "relation": "eq"},
+        "hits": [
+            {
+                "_index": "logs-2026-02-04",
+                "_id": "1",
+                "_source": {
+                    "@timestamp": "2026-02-04T10:00:00Z",
+                    "level": "ERROR",
+                    "service": "api-service",
+                    "message": "Connection timeout"
+                }
+            }
+        ]
+    }
+}
+
+_MOCK_INDICES_STATS = {
+    "indices": {
+        "logs-2026-02-04": {
+            "total": {
+                "docs": {"count": 1000, "deleted": 0},
+                "store": {"size_in_bytes": 1048576}
+            },
+            "primaries": {
+                "docs": {"count": 1000},
+                "store": {"size_in_bytes": 524288}
+            }
+        }
+    }
+}
+
+_MOCK_CAT_INDICES = [
+    {
+        "index": "logs-2026-02-04",
+        "health": "green",
+        "status": "open",
+        "docs.count": "1000",
+        "store.size": "1mb"
+    }
+]
+
+_MOCK_INDEX_MAPPINGS = {
+    "logs-2026-02-04": {
+        "mappings": {
+            "properties": {
+                "@timestamp": {"type": "date"},
+                "level": {"type": "keyword"},
+                "service": {"type": "keyword"}
+            }
+        }
+    }
+}
 
+_SAMPLE_LOG_DATA = MappingProxyType({
+    "@timestamp": "2026-02-04T10:00:00Z",
+    "level": "ERROR",
+    "service": "api-service",
+    "message": "Connection timeout after 30s",
+    "host": "server-01",
+    "environment": "production",
+    "request_id": "req-123456",
+    "user": "user1",
+    "duration_ms": 30000,
+    "status_code": 500,
+    "stack_trace": "Error at api-service.handler.process()",
+    "error_code": "ERR_5001"
+})
+
+_SAMPLE_SEARCH_RESPONSE = MappingProxyType({
+    "took": 5,
+    "timed_out": False,
+    "hits": {
+        "total": {"value": 100, "relation": "eq"},
+        "max_score": 1.0,
+        "hits": [
+            {
+                "_index": "logs-2026-02-04",
+                "_id": "1",
+                "_score": 1.0,
+                "_source": {
+                    "@timestamp": "2026-02-04T10:00:00Z",
+                    "level": "ERROR",
+                    "service": "api-service",
+                    "message": "Connection timeout"
+                }
+            }
+        ]
+    }
+})
+
+_SAMPLE_AGGREGATION_RESPONSE = MappingProxyType({
+    "took": 10,
+    "hits": {"total": {"value": 500}},
+    "aggregations": {
+        "results": {
+            "buckets": [
+                {"key": "api-service", "doc_count": 200},
+                {"key": "web-service", "doc_count": 150},
+                {"key": "db-service", "doc_count": 100}
+            ]
+        }
+    }
+})
+
+
+# ============================================================================
+# Fake OpenSearch Client
+# ============================================================================
+
+class FakeOpenSearch:
+    """
+    Hand-written stand-in for AsyncOpenSearch.
+
+    Only the APIs the routers call exist, each an AsyncMock, so tests never
+    build a spec from the real client or grow a MagicMock attribute tree.
+    A misspelled API fails with AttributeError instead of passing silently.
+    """
+
+    def __init__(self):
+        self.search = AsyncMock()
+        self.count = AsyncMock()
+        self.cluster = SimpleNamespace(health=AsyncMock())
+        self.cat = SimpleNamespace(indices=AsyncMock())
+        self.indices = SimpleNamespace(
+            stats=AsyncMock(),
+            get_mapping=AsyncMock(),
+            get_settings=AsyncMock(),
+            delete=AsyncMock(),
+        )
+        self.reset()
+
+    def _methods(self):
+        yield self.search
+        yield self.count
+        for namespace in (self.cluster, self.cat, self.indices):
+            yield from vars(namespace).values()
+
+    def reset(self) -> None:
+        """Clear calls, return values and side effects, then restore defaults."""
+        for method in self._methods():
+            method.reset_mock(return_value=True, side_effect=True)
+        self.cluster.health.return_value = _MOCK_CLUSTER_HEALTH
+        self.search.return_value = _MOCK_SEARCH_RESPONSE
+        self.indices.stats.return_value = _MOCK_INDICES_STATS
+        self.cat.indices.return_value = _MOCK_CAT_INDICES
+        self.indices.get_mapping.return_value = _MOCK_INDEX_MAPPINGS
+        self.indices.delete.return_value = {"acknowledged": True}
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
 
 @pytest.fixture(scope="session")
 def test_settings() -> Settings:
@@ -32,95 +214,62 @@ def test_settings() -> Settings:
     )
 
 
-@pytest.fixture(scope="function")
-def mock_opensearch_client() -> Mock:
+@pytest.fixture(scope="session", autouse=True)
+def fast_password_hashing() -> None:
     """
-    Create a mock OpenSearch client for unit tests.
+    Hash with bcrypt's minimum cost for the test run.
 
-    Returns:
-        Mock: Mocked OpenSearch client
+    The production cost of 12 rounds takes hundreds of milliseconds per
+    hash, and every login or authenticated request hashes the configured
+    admin password.
     """
-    mock_client = MagicMock()
+    pwd_context.update(bcrypt__rounds=4)
 
-    # Mock cluster health
-    mock_client.cluster.health.return_value = {
-        "cluster_name": "test-cluster",
-        "status": "green",
-        "number_of_nodes": 3,
-        "active_shards": 10
-    }
 
-    # Mock search response
-    mock_client.search.return_value = {
-        "took": 5,
-        "hits": {
-            "total": {"value": 100, "relation": "eq"},
-            "hits": [
-                {
-                    "_index": "logs-2026-02-04",
-                    "_id": "1",
-                    "_source": {
-                        "@timestamp": "2026-02-04T10:00:00Z",
-                        "level": "ERROR",
-                        "service": "api-service",
-                        "message": "Connection timeout"
-                    }
-                }
-            ]
-        }
-    }
+@pytest.fixture(scope="session")
+def mock_opensearch_client() -> FakeOpenSearch:
+    """
+    Create a fake OpenSearch client for unit tests.
 
-    # Mock indices stats
-    mock_client.indices.stats.return_value = {
-        "indices": {
-            "logs-2026-02-04": {
-                "total": {
-                    "docs": {"count": 1000, "deleted": 0},
-                    "store": {"size_in_bytes": 1048576}
-                },
-                "primaries": {
-                    "docs": {"count": 1000},
-                    "store": {"size_in_bytes": 524288}
-                }
-            }
-        }
-    }
+    Built once per session; reset_mock_opensearch_client restores it
+    before every test.
 
-    # Mock indices list
-    mock_client.cat.indices.return_value = [
-        {
-            "index": "logs-2026-02-04",
-            "health": "green",
-            "status": "open",
-            "docs.count": "1000",
-            "store.size": "1mb"
-        }
-    ]
+    Returns:
+        FakeOpenSearch: Fake AsyncOpenSearch client (awaitable methods)
+    """
+    return FakeOpenSearch()
 
-    # Mock index mappings
-    mock_client.indices.get_mapping.return_value = {
-        "logs-2026-02-04": {
-            "mappings": {
-                "properties": {
-                    "@timestamp": {"type": "date"},
-                    "level": {"type": "keyword"},
-                    "service": {"type": "keyword"}
-                }
-            }
-        }
-    }
 
-    # Mock index deletion
-    mock_client.indices.delete.return_value = {"acknowledged": True}
+@pytest.fixture(autouse=True)
+def reset_mock_opensearch_client(mock_opensearch_client: FakeOpenSearch) -> None:
+    """
+    Clear calls, return values and side effects left by the previous test.
+    """
+    mock_opensearch_client.reset()
+
 
-    return mock_client
+@pytest.fixture(autouse=True)
+def reset_caches() -> None:
+    """
+    Clear cached health data and index metadata so each test sees its own
+    mock response, and restart rate limit windows so requests from earlier
+    tests on the shared client do not count.
+    """
+    OpenSearchClient._health_cache = None
+    health_cache.clear()
+    index_metadata_cache.clear()
+    reset_rate_limits()
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def test_client() -> Generator[TestClient, None, None]:
     """
     Create FastAPI test client.
 
+    Shared by the whole session: the app's lifespan and the client's event
+    loop portal start once instead of per test. Per-test state (mocks,
+    caches, patched settings) is reset by the fixtures above.
+
     Yields:
         TestClient: FastAPI test client
     """
@@ -128,79 +277,34 @@ def test_client() -> Generator[TestClient, None, None]:
         yield client
 
 
-@pytest.fixture(scope="function")
-def sample_log_data() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_log_data() -> Mapping[str, Any]:
     """
     Sample log data for testing.
 
     Returns:
-        dict: Sample log entry
-    """
-    return {
-        "@timestamp": "2026-02-04T10:00:00Z",
-        "level": "ERROR",
-        "service": "api-service",
-        "message": "Connection timeout after 30s",
-        "host": "server-01",
-        "environment": "production",
-        "request_id": "req-123456",
-        "user": "user1",
-        "duration_ms": 30000,
-        "status_code": 500,
-        "stack_trace": "Error at api-service.handler.process()",
-        "error_code": "ERR_5001"
-    }
+        Mapping: Sample log entry (read-only)
+    """
+    return _SAMPLE_LOG_DATA
 
 
-@pytest.fixture(scope="function")
-def sample_search_response() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_search_response() -> Mapping[str, Any]:
     """
     Sample OpenSearch search response.
 
     Returns:
-        dict: Sample search response
-    """
-    return {
-        "took": 5,
-        "timed_out": False,
-        "hits": {
-            "total": {"value": 100, "relation": "eq"},
-            "max_score": 1.0,
-            "hits": [
-                {
-                    "_index": "logs-2026-02-04",
-                    "_id": "1",
-                    "_score": 1.0,
-                    "_source": {
-                        "@timestamp": "2026-02-04T10:00:00Z",
-                        "level": "ERROR",
-                        "service": "api-service",
-                        "message": "Connection timeout"
-                    }
-                }
-            ]
-        }
-    }
+        Mapping: Sample search response (read-only)
+    """
+    return _SAMPLE_SEARCH_RESPONSE
 
 
-@pytest.fixture(scope="function")
-def sample_aggregation_response() -> Dict[str, Any]:
+@pytest.fixture(scope="session")
+def sample_aggregation_response() -> Mapping[str, Any]:
     """
     Sample OpenSearch aggregation response.
 
     Returns:
-        dict: Sample aggregation response
-    """
-    return {
-        "took": 10,
-        "hits": {"total": {"value": 500}},
-        "aggregations": {
-            "results": {
-                "buckets": [
-                    {"key": "api-service", "doc_count": 200},
-                    {"key": "web-service", "doc_count": 150},
-                    {"key": "db-service", "doc_count": 100}
-                ]
-            }
-        }
-    }
+        Mapping: Sample aggregation response (read-only)
+    """
+    return _SAMPLE_AGGREGATION_RESPONSE
@@ -8,219 +8,167 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+import json
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import patch, MagicMock
 from fastapi import status
 from opensearchpy import exceptions as os_exceptions
 
 
-class TestAggregateEndpoint:
-    """Test /aggregate endpoint"""
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_terms_aggregation(self, mock_get_os, test_client, sample_aggregation_response):
-        """Test terms aggregation for top values"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
-
-        agg_request = {
-            "query": "level:ERROR",
-            "indices": ["logs-*"],
-            "agg_type": "terms",
-            "field": "service",
-            "size": 5
+# ============================================================================
+# OpenSearch Responses
+# ============================================================================
+# Shared by the parametrized cases; read-only.
+
+_DATE_HISTOGRAM_RESPONSE = MappingProxyType({
+    "took": 15,
+    "hits": {"total": {"value": 500}},
+    "aggregations": {
+        "results": {
+            "buckets": [
+                {"key": 1707062400000, "key_as_string": "2026-02-04T10:00:00Z", "doc_count": 100},
+                {"key": 1707066000000, "key_as_string": "2026-02-04T11:00:00Z", "doc_count": 150}
+            ]
         }
+    }
+})
 
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
+_STATS_RESPONSE = MappingProxyType({
+    "took": 8,
+    "hits": {"total": {"value": 1000}},
+    "aggregations": {
+        "results": {"count": 1000, "min": 10.0, "max": 5000.0, "avg": 250.5, "sum": 250500.0}
+    }
+})
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["status"] == "success"
-        assert "buckets" in data["data"]
-        assert len(data["data"]["buckets"]) > 0
-        assert data["data"]["buckets"][0]["key"] == "api-service"
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_date_histogram_aggregation(self, mock_get_os, test_client):
-        """Test date_histogram aggregation for time series"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "took": 15,
-            "hits": {"total": {"value": 500}},
-            "aggregations": {
-                "results": {
-                    "buckets": [
-                        {"key": 1707062400000, "key_as_string": "2026-02-04T10:00:00Z", "doc_count": 100},
-                        {"key": 1707066000000, "key_as_string": "2026-02-04T11:00:00Z", "doc_count": 150}
-                    ]
-                }
-            }
-        }
-        mock_get_os.return_value = mock_client
+_CARDINALITY_RESPONSE = MappingProxyType({
+    "took": 5,
+    "hits": {"total": {"value": 1000}},
+    "aggregations": {"results": {"value": 42}}  # 42 unique users
+})
 
-        agg_request = {
-            "query": "level:ERROR",
-            "indices": ["logs-*"],
-            "agg_type": "date_histogram",
-            "field": "@timestamp",
-            "interval": "1h"
-        }
 
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
+@pytest.fixture(autouse=True)
+def mock_os(monkeypatch, mock_opensearch_client):
+    """Route the aggregations router's OpenSearch calls to the shared fake client."""
+    monkeypatch.setattr("app.routers.aggregations.get_opensearch", lambda: mock_opensearch_client)
+    return mock_opensearch_client
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["status"] == "success"
-        assert len(data["data"]["buckets"]) == 2
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_stats_aggregation(self, mock_get_os, test_client):
-        """Test stats aggregation for numeric analysis"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "took": 8,
-            "hits": {"total": {"value": 1000}},
-            "aggregations": {
-                "results": {
-                    "count": 1000,
-                    "min": 10.0,
-                    "max": 5000.0,
-                    "avg": 250.5,
-                    "sum": 250500.0
-                }
-            }
-        }
-        mock_get_os.return_value = mock_client
 
-        agg_request = {
-            "indices": ["logs-*"],
-            "agg_type": "stats",
-            "field": "duration_ms"
-        }
+class TestAggregateEndpoint:
+    """Test /aggregate endpoint"""
+
+    @pytest.mark.parametrize("agg_request, os_response, expected_count, expected_first", [
+        pytest.param(
+            {"query": "level:ERROR", "indices": ["logs-*"], "agg_type": "terms", "field": "service", "size": 5},
+            None,
+            3,
+            {"key": "api-service", "doc_count": 200, "data": None},
+            id="terms",
+        ),
+        pytest.param(
+            {"query": "level:ERROR", "indices": ["logs-*"], "agg_type": "date_histogram",
+             "field": "@timestamp", "interval": "1h"},
+            _DATE_HISTOGRAM_RESPONSE,
+            2,
+            {"key": 1707062400000, "doc_count": 100, "data": None},
+            id="date_histogram",
+        ),
+        pytest.param(
+            {"indices": ["logs-*"], "agg_type": "stats", "field": "duration_ms"},
+            _STATS_RESPONSE,
+            1,
+            {"key": "stats", "doc_count": 1000,
+             "data": {"min": 10.0, "max": 5000.0, "avg": 250.5, "sum": 250500.0}},
+            id="stats",
+        ),
+        pytest.param(
+            {"indices": ["logs-*"], "agg_type": "cardinality", "field": "user"},
+            _CARDINALITY_RESPONSE,
+            1,
+            {"key": "unique_values", "doc_count": 42, "data": None},
+            id="cardinality",
+        ),
+        pytest.param(
+            {"query": "level:ERROR", "indices": ["logs-*"], "agg_type": "terms", "field": "service",
+             "time_range": {"field": "@timestamp", "start": "now-24h", "end": "now"}, "size": 10},
+            None,
+            3,
+            {"key": "api-service", "doc_count": 200, "data": None},
+            id="with_time_range",
+        ),
+        pytest.param(
+            # No filter query, so match_all
+            {"indices": ["logs-*"], "agg_type": "terms", "field": "level"},
+            None,
+            3,
+            {"key": "api-service", "doc_count": 200, "data": None},
+            id="without_query",
+        ),
+    ])
+    def test_aggregation(
+        self, agg_request, os_response, expected_count, expected_first,
+        test_client, mock_os, sample_aggregation_response
+    ):
+        """Test each aggregation type is run and parsed into buckets"""
+        mock_os.search.return_value = os_response or sample_aggregation_response
 
         response = test_client.post("/api/v1/aggregate", json=agg_request)
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "success"
-        assert data["data"]["buckets"][0]["data"]["avg"] == 250.5
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_cardinality_aggregation(self, mock_get_os, test_client):
-        """Test cardinality aggregation for unique count"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = {
-            "took": 5,
-            "hits": {"total": {"value": 1000}},
+        assert len(data["data"]["buckets"]) == expected_count
+        assert data["data"]["buckets"][0] == expected_first
+
+    def test_large_bucket_response_streamed(self, test_client, mock_os):
+        """Test large bucket results stream the same JSON as small ones"""
+        mock_os.search.return_value = {
+            "took": 12,
+            "hits": {"total": {"value": 5000}},
             "aggregations": {
                 "results": {
-                    "value": 42  # 42 unique users
+                    "buckets": [
+                        {"key": f"host-{i}", "doc_count": i} for i in range(1200)
+                    ]
                 }
             }
         }
-        mock_get_os.return_value = mock_client
-
-        agg_request = {
-            "indices": ["logs-*"],
-            "agg_type": "cardinality",
-            "field": "user"
-        }
 
+        agg_request = {"agg_type": "terms", "field": "host", "size": 1200}
         response = test_client.post("/api/v1/aggregate", json=agg_request)
 
         assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/json"
         data = response.json()
         assert data["status"] == "success"
-        assert data["data"]["buckets"][0]["doc_count"] == 42
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_aggregation_with_time_range(self, mock_get_os, test_client, sample_aggregation_response):
-        """Test aggregation with time range filter"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
-
-        agg_request = {
-            "query": "level:ERROR",
-            "indices": ["logs-*"],
-            "agg_type": "terms",
-            "field": "service",
-            "time_range": {
-                "field": "@timestamp",
-                "start": "now-24h",
-                "end": "now"
-            },
-            "size": 10
-        }
-
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
-
-        assert response.status_code == status.HTTP_200_OK
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_aggregation_without_query(self, mock_get_os, test_client, sample_aggregation_response):
-        """Test aggregation without filter query (match_all)"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
-
-        agg_request = {
-            "indices": ["logs-*"],
-            "agg_type": "terms",
-            "field": "level"
-        }
-
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
-
-        assert response.status_code == status.HTTP_200_OK
+        assert data["message"] == "Aggregation completed in 12ms"
+        assert data["data"]["total"] == 5000
+        assert data["data"]["took"] == 12
+        assert len(data["data"]["buckets"]) == 1200
+        assert data["data"]["buckets"][1199] == {"key": "host-1199", "doc_count": 1199, "data": None}
 
 
 class TestTopValuesEndpoint:
     """Test /top-values/{field} convenience endpoint"""
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_top_values_get_request(self, mock_get_os, test_client, sample_aggregation_response):
+    @pytest.mark.parametrize("field, params", [
+        pytest.param("level", {"size": 5}, id="get_request"),
+        pytest.param("service", {"query": "level:ERROR", "size": 10}, id="with_query_filter"),
+        pytest.param("host", {"indices": "logs-2026-02-04,logs-2026-02-03", "size": 5}, id="multiple_indices"),
+    ])
+    def test_top_values(self, field, params, test_client, mock_os, sample_aggregation_response):
         """Test GET /top-values/{field} shortcut"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
+        mock_os.search.return_value = sample_aggregation_response
 
-        response = test_client.get("/api/v1/top-values/level", params={"size": 5})
+        response = test_client.get(f"/api/v1/top-values/{field}", params=params)
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "success"
         assert "buckets" in data["data"]
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_top_values_with_query_filter(self, mock_get_os, test_client, sample_aggregation_response):
-        """Test top values with query filter"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get(
-            "/api/v1/top-values/service",
-            params={"query": "level:ERROR", "size": 10}
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_top_values_multiple_indices(self, mock_get_os, test_client, sample_aggregation_response):
-        """Test top values across multiple indices"""
-        mock_client = MagicMock()
-        mock_client.search.return_value = sample_aggregation_response
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get(
-            "/api/v1/top-values/host",
-            params={"indices": "logs-2026-02-04,logs-2026-02-03", "size": 5}
-        )
-
-        assert response.status_code == status.HTTP_200_OK
-
 
 class TestAggregationValidation:
     """Test aggregation request validation"""
@@ -239,12 +187,8 @@ class TestAggregationValidation:
         # Should fail validation or return error
         assert response.status_code in [400, 422]
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_unsupported_aggregation_type(self, mock_get_os, test_client):
+    def test_unsupported_aggregation_type(self, test_client, mock_os):
         """Test unsupported aggregation type returns error"""
-        mock_client = MagicMock()
-        mock_get_os.return_value = mock_client
-
         agg_request = {
             "indices": ["logs-*"],
             "agg_type": "unsupported_type",
@@ -253,65 +197,95 @@ class TestAggregationValidation:
 
         response = test_client.post("/api/v1/aggregate", json=agg_request)
 
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        # Rejected by request validation before reaching OpenSearch
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_os.search.assert_not_called()
 
 
 class TestAggregationErrorHandling:
     """Test error handling in aggregation endpoints"""
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_invalid_field_error(self, mock_get_os, test_client):
-        """Test handling of invalid field for aggregation"""
-        mock_client = MagicMock()
-        mock_client.search.side_effect = os_exceptions.RequestError(
-            400, "illegal_argument_exception", {"error": "Field not found"}
-        )
-        mock_get_os.return_value = mock_client
+    @pytest.mark.parametrize("side_effect, expected_status", [
+        pytest.param(
+            os_exceptions.RequestError(400, "illegal_argument_exception", {"error": "Field not found"}),
+            status.HTTP_400_BAD_REQUEST,
+            id="invalid_field",
+        ),
+        pytest.param(
+            os_exceptions.NotFoundError(404, "index_not_found_exception", {}),
+            status.HTTP_404_NOT_FOUND,
+            id="index_not_found",
+        ),
+        pytest.param(
+            os_exceptions.ConnectionError("N/A", "Connection refused", None),
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            id="connection_error",
+        ),
+    ])
+    def test_opensearch_error(self, side_effect, expected_status, test_client, mock_os):
+        """Test OpenSearch errors map to HTTP status codes"""
+        mock_os.search.side_effect = side_effect
 
         agg_request = {
             "indices": ["logs-*"],
             "agg_type": "terms",
-            "field": "nonexistent_field"
+            "field": "service"
         }
 
         response = test_client.post("/api/v1/aggregate", json=agg_request)
 
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.status_code == expected_status
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_index_not_found(self, mock_get_os, test_client):
-        """Test handling of non-existent index"""
-        mock_client = MagicMock()
-        mock_client.search.side_effect = os_exceptions.NotFoundError(
-            404, "index_not_found_exception", {}
+
+class TestBuildAggregationQuery:
+    """Test aggregation query building logic"""
+
+    def test_terms_query_with_filter_and_time_range(self):
+        """Test terms query body built from a full request"""
+        from app.models.search import AggregationRequest
+        from app.routers.aggregations import build_aggregation_query
+
+        agg_req = AggregationRequest(
+            query="level:ERROR",
+            agg_type="terms",
+            field="service",
+            size=5,
+            time_range={"field": "@timestamp", "start": "now-1h", "end": "now"}
         )
-        mock_get_os.return_value = mock_client
 
-        agg_request = {
-            "indices": ["nonexistent-*"],
-            "agg_type": "terms",
-            "field": "service"
-        }
+        body = build_aggregation_query(agg_req)
 
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
+        assert body["size"] == 0
+        assert "must" not in body["query"]["bool"]
+        assert body["query"]["bool"]["filter"] == [
+            {"query_string": {"query": "level:ERROR", "default_operator": "AND"}},
+            {"range": {"@timestamp": {"gte": "now-1h", "lte": "now"}}}
+        ]
+        assert body["aggs"]["results"] == {"terms": {"field": "service", "size": 5}}
 
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+    def test_query_without_filter_uses_empty_bool(self):
+        """Test an empty bool (match all) is used when no filter query is given"""
+        from app.models.search import AggregationRequest
+        from app.routers.aggregations import build_aggregation_query
 
-    @patch('app.routers.aggregations.get_opensearch')
-    def test_opensearch_connection_error(self, mock_get_os, test_client):
-        """Test handling of OpenSearch connection errors"""
-        mock_client = MagicMock()
-        mock_client.search.side_effect = os_exceptions.ConnectionError(
-            "N/A", "Connection refused", None
-        )
-        mock_get_os.return_value = mock_client
+        agg_req = AggregationRequest(agg_type="stats", field="duration_ms")
 
-        agg_request = {
-            "indices": ["logs-*"],
-            "agg_type": "terms",
-            "field": "service"
-        }
+        body = build_aggregation_query(agg_req)
 
-        response = test_client.post("/api/v1/aggregate", json=agg_request)
+        assert body["query"] == {"bool": {"filter": []}}
+        assert body["aggs"]["results"] == {"stats": {"field": "duration_ms"}}
+
+    def test_query_body_sent_as_cached_json(self, test_client, mock_os, sample_aggregation_response):
+        """Test repeated requests reuse one serialized query body"""
+        from app.models.search import AggregationRequest
+        from app.routers.aggregations import build_aggregation_query
+
+        mock_os.search.return_value = sample_aggregation_response
+
+        agg_request = {"agg_type": "terms", "field": "service", "size": 7}
+        test_client.post("/api/v1/aggregate", json=agg_request)
+        test_client.post("/api/v1/aggregate", json=agg_request)
 
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        first, second = (call.kwargs["body"] for call in mock_os.search.call_args_list)
+        assert first is second
+        assert json.loads(first) == build_aggregation_query(AggregationRequest(**agg_request))
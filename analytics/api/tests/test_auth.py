@@ -1,19 +1,21 @@
 """
 Unit Tests for JWT Authentication
 
-Tests token creation, validation, user authentication,
-and auth-enabled/disabled behavior.
+Tests login, user authentication, auth-enabled/disabled behavior
+and rate limiting through the HTTP client. Token and password helpers
+are covered in test_auth_unit.py.
 
 Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
 import time
-from unittest.mock import patch
 
 import pytest
 from fastapi import status
-from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.middleware.auth import create_access_token
 
 
 # ============================================================================
@@ -21,112 +23,45 @@ from fastapi.testclient import TestClient
 # ============================================================================
 
 @pytest.fixture
-def auth_disabled_app():
-    """Create a test app with auth disabled (default)."""
-    with patch.dict("os.environ", {"AUTH_ENABLED": "false", "API_RATE_LIMIT_ENABLED": "false"}, clear=False):
-        # Re-import to pick up new settings
-        import importlib
-        import app.config
-        importlib.reload(app.config)
-        import app.middleware.auth
-        importlib.reload(app.middleware.auth)
-        import app.routers.auth
-        importlib.reload(app.routers.auth)
-        import app.main
-        importlib.reload(app.main)
-        client = TestClient(app.main.app)
-        yield client
+def auth_disabled_app(monkeypatch, test_client):
+    """Test client with auth disabled (default)."""
+    monkeypatch.setattr(settings, "auth_enabled", False)
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    return test_client
 
 
 @pytest.fixture
-def auth_enabled_app():
-    """Create a test app with auth enabled."""
-    with patch.dict("os.environ", {
-        "AUTH_ENABLED": "true",
-        "AUTH_ADMIN_USERNAME": "testadmin",
-        "AUTH_ADMIN_PASSWORD": "testpass123",
-        "API_SECRET_KEY": "test-secret-key-for-jwt",
-        "API_RATE_LIMIT_ENABLED": "false",
-    }, clear=False):
-        import importlib
-        import app.config
-        importlib.reload(app.config)
-        import app.middleware.auth
-        importlib.reload(app.middleware.auth)
-        import app.routers.auth
-        importlib.reload(app.routers.auth)
-        import app.main
-        importlib.reload(app.main)
-        client = TestClient(app.main.app)
-        yield client
-
+def auth_enabled_app(monkeypatch, test_client):
+    """Test client with auth enabled."""
+    # Auth reads settings per request, so patching the shared settings
+    # object is enough; no module reloads or app rebuilds
+    monkeypatch.setattr(settings, "auth_enabled", True)
+    monkeypatch.setattr(settings, "auth_admin_username", "testadmin")
+    monkeypatch.setattr(settings, "auth_admin_password", "testpass123")
+    monkeypatch.setattr(settings, "secret_key", "test-secret-key-for-jwt")
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    return test_client
 
-# ============================================================================
-# Tests: Token Operations
-# ============================================================================
 
-class TestTokenOperations:
-    """Test JWT token creation and validation."""
-
-    def test_create_access_token(self):
-        """Token creation returns a non-empty string."""
-        from app.middleware.auth import create_access_token
-        token = create_access_token(data={"sub": "testuser", "role": "admin"})
-        assert isinstance(token, str)
-        assert len(token) > 0
-
-    def test_decode_valid_token(self):
-        """Valid token can be decoded."""
-        from app.middleware.auth import create_access_token, decode_token
-        token = create_access_token(data={"sub": "testuser", "role": "admin"})
-        payload = decode_token(token)
-        assert payload["sub"] == "testuser"
-        assert payload["role"] == "admin"
-
-    def test_decode_token_has_expiry(self):
-        """Token contains expiry claim."""
-        from app.middleware.auth import create_access_token, decode_token
-        token = create_access_token(data={"sub": "testuser"})
-        payload = decode_token(token)
-        assert "exp" in payload
-
-    def test_decode_invalid_token_raises(self):
-        """Invalid token raises HTTPException."""
-        from fastapi import HTTPException
-        from app.middleware.auth import decode_token
-        with pytest.raises(HTTPException) as exc_info:
-            decode_token("invalid.token.string")
-        assert exc_info.value.status_code == 401
-
-    def test_decode_token_missing_subject_raises(self):
-        """Token without subject raises HTTPException."""
-        from fastapi import HTTPException
-        from jose import jwt
-        from app.config import settings
-        from app.middleware.auth import decode_token
-        token = jwt.encode({"role": "admin"}, settings.secret_key, algorithm=settings.algorithm)
-        with pytest.raises(HTTPException):
-            decode_token(token)
-
-
-# ============================================================================
-# Tests: Password Operations
-# ============================================================================
+@pytest.fixture
+def rate_limited_app(monkeypatch, test_client):
+    """Test client with rate limiting enabled at 100 requests per minute."""
+    # The middleware reads its limit from settings per request
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    monkeypatch.setattr(settings, "rate_limit_per_minute", 100)
+    monkeypatch.setattr(settings, "auth_enabled", False)
+    return test_client
 
-class TestPasswordOperations:
-    """Test password hashing and verification."""
 
-    def test_verify_correct_password(self):
-        """Correct password verification succeeds."""
-        from app.middleware.auth import pwd_context
-        hashed = pwd_context.hash("mypassword")
-        assert pwd_context.verify("mypassword", hashed)
+@pytest.fixture
+def admin_token(auth_enabled_app):
+    """
+    Bearer token for the test admin, minted in-process.
 
-    def test_verify_wrong_password(self):
-        """Wrong password verification fails."""
-        from app.middleware.auth import pwd_context
-        hashed = pwd_context.hash("mypassword")
-        assert not pwd_context.verify("wrongpassword", hashed)
+    test_login_success covers the login endpoint; other tests only need a
+    valid token, so they skip the HTTP round trip and bcrypt verify.
+    """
+    return create_access_token(data={"sub": "testadmin", "role": "admin"})
 
 
 # ============================================================================
@@ -163,19 +98,11 @@ class TestAuthEnabled:
         )
         assert response.status_code == 401
 
-    def test_get_me_with_token(self, auth_enabled_app):
+    def test_get_me_with_token(self, auth_enabled_app, admin_token):
         """Authenticated /auth/me returns user info."""
-        # Login first
-        login_response = auth_enabled_app.post(
-            "/auth/token",
-            data={"username": "testadmin", "password": "testpass123"},
-        )
-        token = login_response.json()["access_token"]
-
-        # Get user info
         response = auth_enabled_app.get(
             "/auth/me",
-            headers={"Authorization": f"Bearer {token}"},
+            headers={"Authorization": f"Bearer {admin_token}"},
         )
         assert response.status_code == 200
         data = response.json()
@@ -221,37 +148,31 @@ class TestAuthDisabled:
 class TestRateLimiting:
     """Test rate limiting middleware behavior."""
 
-    def test_rate_limit_headers_present(self):
+    def test_rate_limit_headers_present(self, rate_limited_app):
         """Response includes rate limit headers when enabled."""
-        with patch.dict("os.environ", {
-            "API_RATE_LIMIT_ENABLED": "true",
-            "API_RATE_LIMIT_PER_MINUTE": "100",
-            "AUTH_ENABLED": "false",
-        }, clear=False):
-            import importlib
-            import app.config
-            importlib.reload(app.config)
-            import app.main
-            importlib.reload(app.main)
-            client = TestClient(app.main.app)
-            response = client.get("/")
-            assert "X-RateLimit-Limit" in response.headers
-            assert "X-RateLimit-Remaining" in response.headers
-
-    def test_health_exempt_from_rate_limit(self):
+        response = rate_limited_app.get("/")
+        assert response.headers["X-RateLimit-Limit"] == "100"
+        assert response.headers["X-RateLimit-Remaining"] == "99"
+
+    def test_rate_limit_exceeded(self, rate_limited_app, monkeypatch):
+        """Requests past the limit are rejected with 429."""
+        monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+        assert rate_limited_app.get("/").status_code == 200
+        response = rate_limited_app.get("/")
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "60"
+
+    def test_health_exempt_from_rate_limit(self, rate_limited_app, monkeypatch):
         """Health endpoints are exempt from rate limiting."""
-        with patch.dict("os.environ", {
-            "API_RATE_LIMIT_ENABLED": "true",
-            "API_RATE_LIMIT_PER_MINUTE": "1",
-            "AUTH_ENABLED": "false",
-        }, clear=False):
-            import importlib
-            import app.config
-            importlib.reload(app.config)
-            import app.main
-            importlib.reload(app.main)
-            client = TestClient(app.main.app)
-            # Health should always work even under rate limit
-            for _ in range(5):
-                response = client.get("/health/liveness")
-                assert response.status_code == 200
+        monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+        # Health should always work even under rate limit
+        for _ in range(5):
+            response = rate_limited_app.get("/health/liveness")
+            assert response.status_code == 200
+            assert "X-RateLimit-Limit" not in response.headers
+
+    def test_only_exact_health_paths_exempt(self, rate_limited_app, monkeypatch):
+        """Paths that merely start with /health are still rate limited."""
+        monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+        rate_limited_app.get("/healthz")
+        assert rate_limited_app.get("/healthz").status_code == 429
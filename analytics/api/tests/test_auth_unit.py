@@ -0,0 +1,103 @@
+"""
+Unit Tests for JWT Token and Password Operations
+
+Exercises the auth helpers directly, without the HTTP client or the
+auth-enabled/disabled app fixtures in test_auth.py.
+
+Authors: Balaji Rajan and Claude (Anthropic)
+License: Apache 2.0
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.config import settings
+from app.middleware.auth import create_access_token, decode_token, get_users_db, pwd_context
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def hashed_mypassword():
+    """bcrypt hash of "mypassword", computed once per session."""
+    return pwd_context.hash("mypassword")
+
+
+# ============================================================================
+# Tests: Token Operations
+# ============================================================================
+
+@pytest.mark.unit
+class TestTokenOperations:
+    """Test JWT token creation and validation."""
+
+    def test_create_access_token(self):
+        """Token creation returns a non-empty string."""
+        token = create_access_token(data={"sub": "testuser", "role": "admin"})
+        assert isinstance(token, str)
+        assert len(token) > 0
+
+    def test_decode_valid_token(self):
+        """Valid token can be decoded."""
+        token = create_access_token(data={"sub": "testuser", "role": "admin"})
+        payload = decode_token(token)
+        assert payload["sub"] == "testuser"
+        assert payload["role"] == "admin"
+
+    def test_decode_token_has_expiry(self):
+        """Token contains expiry claim."""
+        token = create_access_token(data={"sub": "testuser"})
+        payload = decode_token(token)
+        assert "exp" in payload
+
+    def test_decode_invalid_token_raises(self):
+        """Invalid token raises HTTPException."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_token("invalid.token.string")
+        assert exc_info.value.status_code == 401
+
+    def test_decode_token_missing_subject_raises(self):
+        """Token without subject raises HTTPException."""
+        token = jwt.encode({"role": "admin"}, settings.secret_key, algorithm=settings.algorithm)
+        with pytest.raises(HTTPException):
+            decode_token(token)
+
+    def test_decode_cached_token_rechecks_expiry(self):
+        """A cached token is rejected once its expiry has passed."""
+        token = create_access_token(data={"sub": "testuser"})
+        payload = decode_token(token)
+        assert decode_token(token) == payload  # served from cache
+        with patch("app.middleware.auth.time.time", return_value=payload["exp"] + 1):
+            with pytest.raises(HTTPException) as exc_info:
+                decode_token(token)
+        assert exc_info.value.status_code == 401
+
+
+# ============================================================================
+# Tests: Password Operations
+# ============================================================================
+
+@pytest.mark.unit
+class TestPasswordOperations:
+    """Test password hashing and verification."""
+
+    def test_verify_correct_password(self, hashed_mypassword):
+        """Correct password verification succeeds."""
+        assert pwd_context.verify("mypassword", hashed_mypassword)
+
+    def test_verify_wrong_password(self, hashed_mypassword):
+        """Wrong password verification fails."""
+        assert not pwd_context.verify("wrongpassword", hashed_mypassword)
+
+    def test_config_password_hashed_once(self, monkeypatch):
+        """The configured admin password is hashed once, not per lookup."""
+        monkeypatch.setattr(settings, "auth_admin_password", "hash-once-pass")
+        first = get_users_db()[settings.auth_admin_username]["hashed_password"]
+        second = get_users_db()[settings.auth_admin_username]["hashed_password"]
+        assert first == second
+        assert pwd_context.verify("hash-once-pass", first)
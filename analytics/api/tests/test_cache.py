@@ -0,0 +1,75 @@
+"""
+Unit Tests for the Async TTL Cache
+
+Authors: Balaji Rajan and Claude (Anthropic)
+License: Apache 2.0
+"""
+
+import asyncio
+
+import pytest
+
+from app.cache import AsyncTTLCache
+
+
+async def _fail():
+    raise LookupError("no such index")
+
+
+async def _load_value():
+    return {"ok": True}
+
+
+@pytest.mark.unit
+class TestAsyncTTLCache:
+    """Test AsyncTTLCache single-flight loading and bookkeeping."""
+
+    def test_failed_loads_leave_nothing_behind(self):
+        """Keys whose load fails leave no entry or in-flight record."""
+        cache = AsyncTTLCache(maxsize=2)
+
+        async def run():
+            for i in range(1000):
+                with pytest.raises(LookupError):
+                    await cache.get_or_set(f"missing-{i}", 60, _fail)
+
+        asyncio.run(run())
+
+        assert cache._entries == {}
+        assert cache._pending == {}
+
+    def test_entries_bounded_by_maxsize(self):
+        """The oldest entry is evicted once the cache is full."""
+        cache = AsyncTTLCache(maxsize=2)
+
+        async def run():
+            for i in range(10):
+                await cache.get_or_set(f"index-{i}", 60, _load_value)
+
+        asyncio.run(run())
+
+        assert list(cache._entries) == ["index-8", "index-9"]
+        assert cache._pending == {}
+
+    def test_concurrent_failure_shared_with_waiters(self):
+        """Concurrent callers of a failing loader share its one failure."""
+        cache = AsyncTTLCache()
+        calls = 0
+
+        async def slow_fail():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            raise ConnectionError("Connection refused")
+
+        async def run():
+            return await asyncio.gather(
+                *(cache.get_or_set("health", 60, slow_fail) for _ in range(10)),
+                return_exceptions=True,
+            )
+
+        results = asyncio.run(run())
+
+        assert calls == 1
+        assert all(isinstance(result, ConnectionError) for result in results)
+        assert cache._pending == {}
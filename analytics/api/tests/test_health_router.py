@@ -8,20 +8,32 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
 import pytest
-from unittest.mock import patch, MagicMock
 from fastapi import status
 from opensearchpy import exceptions as os_exceptions
 
+from app.main import app
+from app.opensearch_client import OpenSearchClient
+
+
+@pytest.fixture(autouse=True)
+def mock_os(monkeypatch, mock_opensearch_client):
+    """Route the health router's OpenSearch calls to the shared fake client."""
+    monkeypatch.setattr("app.routers.health.get_opensearch", lambda: mock_opensearch_client)
+    return mock_opensearch_client
+
 
 class TestHealthEndpoints:
     """Test health check endpoints"""
 
-    @patch('app.routers.health.get_opensearch')
-    def test_health_check_healthy(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_health_check_healthy(self, test_client, mock_os):
         """Test /health/ returns healthy status when OpenSearch is up"""
-        mock_get_os.return_value = mock_opensearch_client
-
         response = test_client.get("/health/")
 
         assert response.status_code == status.HTTP_200_OK
@@ -31,13 +43,13 @@ class TestHealthEndpoints:
         assert "environment" in data
         assert "opensearch" in data
         assert data["opensearch"]["status"] == "green"
+        mock_os.cluster.health.assert_awaited_once_with(
+            level="cluster", local=True, timeout="1s", request_timeout=1
+        )
 
-    @patch('app.routers.health.get_opensearch')
-    def test_health_check_opensearch_down(self, mock_get_os, test_client):
+    def test_health_check_opensearch_down(self, test_client, mock_os):
         """Test /health/ returns degraded when OpenSearch is down"""
-        mock_client = MagicMock()
-        mock_client.cluster.health.side_effect = Exception("Connection refused")
-        mock_get_os.return_value = mock_client
+        mock_os.cluster.health.side_effect = Exception("Connection refused")
 
         response = test_client.get("/health/")
 
@@ -46,16 +58,13 @@ class TestHealthEndpoints:
         assert data["status"] == "degraded"
         assert data["opensearch"] is None
 
-    @patch('app.routers.health.get_opensearch')
-    def test_health_check_yellow_cluster(self, mock_get_os, test_client):
+    def test_health_check_yellow_cluster(self, test_client, mock_os):
         """Test /health/ returns partially_healthy for yellow cluster"""
-        mock_client = MagicMock()
-        mock_client.cluster.health.return_value = {
+        mock_os.cluster.health.return_value = {
             "cluster_name": "test",
             "status": "yellow",
             "number_of_nodes": 1
         }
-        mock_get_os.return_value = mock_client
 
         response = test_client.get("/health/")
 
@@ -64,46 +73,106 @@ class TestHealthEndpoints:
         assert data["status"] == "partially_healthy"
         assert data["opensearch"]["status"] == "yellow"
 
+    def test_health_check_reuses_recent_cluster_health(self, test_client, mock_os):
+        """Test back-to-back health checks share one cluster health call"""
+        test_client.get("/health/")
+        test_client.get("/health/readiness")
 
-class TestLivenessProbe:
-    """Test liveness probe endpoint"""
+        assert mock_os.cluster.health.await_count == 1
 
-    def test_liveness_check_always_alive(self, test_client):
-        """Test /health/liveness always returns alive"""
-        response = test_client.get("/health/liveness")
+    def test_cluster_health_cache_is_per_client(self, mock_os):
+        """Test a cached result is not reused for a different client"""
+        other_client = SimpleNamespace(
+            cluster=SimpleNamespace(health=AsyncMock(return_value={"status": "red"}))
+        )
+
+        async def check_both():
+            first = await OpenSearchClient.health_check(mock_os)
+            second = await OpenSearchClient.health_check(other_client)
+            return first, second
+
+        first, second = asyncio.run(check_both())
+
+        assert first["status"] == "green"
+        assert second["status"] == "red"
+        assert other_client.cluster.health.await_count == 1
+
+    def test_health_check_served_from_cache(self, test_client, mock_os):
+        """Test repeated /health/ calls are served from the response cache"""
+        first = test_client.get("/health/")
+        second = test_client.get("/health/")
+
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.headers["Cache-Control"].startswith("public, max-age=")
+        assert second.json() == first.json()
+        assert mock_os.cluster.health.await_count == 1
+
+    def test_concurrent_health_checks_coalesced(self, mock_os):
+        """Test concurrent /health/ misses make one load; waiters report HIT"""
+        async def slow_health(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"cluster_name": "test-cluster", "status": "green", "number_of_nodes": 3}
+
+        mock_os.cluster.health.side_effect = slow_health
+
+        async def check_concurrently():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await asyncio.gather(*(client.get("/health/") for _ in range(5)))
+
+        responses = asyncio.run(check_concurrently())
+
+        assert sorted(response.headers["X-Cache"] for response in responses) == ["HIT"] * 4 + ["MISS"]
+        assert mock_os.cluster.health.await_count == 1
+
+    def test_health_check_serves_stale_when_opensearch_fails(self, monkeypatch, test_client, mock_os):
+        """Test the last good response is served stale during an outage"""
+        fresh = test_client.get("/health/")
+
+        mock_os.cluster.health.side_effect = Exception("Connection refused")
+        # Past the fresh TTL but within the stale window
+        later = time.monotonic() + 30
+        monkeypatch.setattr("app.cache.time.monotonic", lambda: later)
+        response = test_client.get("/health/")
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        assert data["status"] == "alive"
+        assert response.headers["X-Cache"] == "STALE"
+        assert "Response is Stale" in response.headers["Warning"]
+        assert response.json() == fresh.json()
 
-    def test_liveness_check_no_dependencies(self, test_client):
-        """Test liveness check doesn't depend on external services"""
+
+class TestLivenessProbe:
+    """Test liveness probe endpoint"""
+
+    def test_liveness_check_always_alive(self, test_client, mock_os):
+        """Test /health/liveness always returns alive, without touching OpenSearch"""
         # This should succeed even if OpenSearch is down
+        mock_os.cluster.health.side_effect = Exception("Connection refused")
+
         response = test_client.get("/health/liveness")
 
         assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["status"] == "alive"
+        assert response.headers["Cache-Control"] == "no-store"
+        mock_os.cluster.health.assert_not_called()
 
 
 class TestReadinessProbe:
     """Test readiness probe endpoint"""
 
-    @patch('app.routers.health.get_opensearch')
-    def test_readiness_check_ready(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_readiness_check_ready(self, test_client):
         """Test /health/readiness returns ready when OpenSearch is up"""
-        mock_get_os.return_value = mock_opensearch_client
-
         response = test_client.get("/health/readiness")
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
         assert data["status"] == "ready"
 
-    @patch('app.routers.health.get_opensearch')
-    def test_readiness_check_not_ready(self, mock_get_os, test_client):
+    def test_readiness_check_not_ready(self, test_client, mock_os):
         """Test /health/readiness returns not ready when OpenSearch is down"""
-        mock_client = MagicMock()
-        mock_client.cluster.health.side_effect = Exception("Connection refused")
-        mock_get_os.return_value = mock_client
+        mock_os.cluster.health.side_effect = Exception("Connection refused")
 
         response = test_client.get("/health/readiness")
 
@@ -115,10 +184,9 @@ class TestReadinessProbe:
 class TestClusterHealthEndpoint:
     """Test cluster health endpoint"""
 
-    @patch('app.routers.health.get_opensearch')
-    def test_cluster_health_detailed(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_cluster_health_detailed(self, test_client, mock_os):
         """Test /health/cluster returns detailed cluster info"""
-        mock_opensearch_client.cluster.health.return_value = {
+        mock_os.cluster.health.return_value = {
             "cluster_name": "test-cluster",
             "status": "green",
             "number_of_nodes": 3,
@@ -128,7 +196,6 @@ class TestClusterHealthEndpoint:
             "initializing_shards": 0,
             "unassigned_shards": 0
         }
-        mock_get_os.return_value = mock_opensearch_client
 
         response = test_client.get("/health/cluster")
 
@@ -138,14 +205,11 @@ class TestClusterHealthEndpoint:
         assert data["data"]["cluster_name"] == "test-cluster"
         assert data["data"]["number_of_nodes"] == 3
 
-    @patch('app.routers.health.get_opensearch')
-    def test_cluster_health_connection_error(self, mock_get_os, test_client):
+    def test_cluster_health_connection_error(self, test_client, mock_os):
         """Test /health/cluster handles connection errors"""
-        mock_client = MagicMock()
-        mock_client.cluster.health.side_effect = os_exceptions.ConnectionError(
+        mock_os.cluster.health.side_effect = os_exceptions.ConnectionError(
             "N/A", "Connection refused", None
         )
-        mock_get_os.return_value = mock_client
 
         response = test_client.get("/health/cluster")
 
@@ -8,20 +8,66 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
+from operator import attrgetter
+from types import MappingProxyType
+
 import pytest
-from unittest.mock import patch, MagicMock
 from fastapi import status
 from opensearchpy import exceptions as os_exceptions
 
 
+# ============================================================================
+# OpenSearch Responses
+# ============================================================================
+# Built once at import and shared by the tests below; read-only.
+
+_STATS_PATTERN_RESPONSE = MappingProxyType({
+    "indices": {
+        "logs-2026-02-04": {
+            "total": {"docs": {"count": 1000, "deleted": 0}, "store": {"size_in_bytes": 1048576}},
+            "primaries": {"docs": {"count": 1000}, "store": {"size_in_bytes": 524288}}
+        },
+        "logs-2026-02-03": {
+            "total": {"docs": {"count": 800, "deleted": 0}, "store": {"size_in_bytes": 838860}},
+            "primaries": {"docs": {"count": 800}, "store": {"size_in_bytes": 419430}}
+        }
+    }
+})
+
+_SETTINGS_RESPONSE = MappingProxyType({
+    "logs-2026-02-04": {
+        "settings": {
+            "index": {
+                "number_of_shards": "3",
+                "number_of_replicas": "1",
+                "refresh_interval": "1s"
+            }
+        }
+    }
+})
+
+_CAT_INDICES_PATTERN_RESPONSE = (
+    {"index": "logs-2026-02-04", "health": "green", "status": "open", "docs.count": "1000"},
+    {"index": "logs-2026-02-03", "health": "green", "status": "open", "docs.count": "800"}
+)
+
+# Raised by the fake client; one instance serves every case that needs it
+_NOT_FOUND = os_exceptions.NotFoundError(404, "index_not_found_exception", {})
+_CONNECTION_ERROR = os_exceptions.ConnectionError("N/A", "Connection refused", None)
+
+
+@pytest.fixture(autouse=True)
+def mock_os(monkeypatch, mock_opensearch_client):
+    """Route the indices router's OpenSearch calls to the shared fake client."""
+    monkeypatch.setattr("app.routers.indices.get_opensearch", lambda: mock_opensearch_client)
+    return mock_opensearch_client
+
+
 class TestIndexStats:
     """Test index statistics endpoint"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_stats_single_index(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_get_index_stats_single_index(self, test_client):
         """Test GET /indices/{name}/stats for single index"""
-        mock_get_os.return_value = mock_opensearch_client
-
         response = test_client.get("/api/v1/indices/logs-2026-02-04/stats")
 
         assert response.status_code == status.HTTP_200_OK
@@ -31,23 +77,19 @@ class TestIndexStats:
         assert "total" in data["data"]["logs-2026-02-04"]
         assert "primaries" in data["data"]["logs-2026-02-04"]
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_stats_pattern(self, mock_get_os, test_client):
+    def test_get_index_stats_filtered_server_side(self, test_client, mock_os):
+        """Test index stats requests only the returned fields from OpenSearch"""
+        test_client.get("/api/v1/indices/logs-*/stats")
+
+        kwargs = mock_os.indices.stats.call_args.kwargs
+        assert kwargs["metric"] == "docs,store"
+        assert kwargs["level"] == "indices"
+        assert "indices.*.total.docs.count" in kwargs["filter_path"]
+        assert "indices.*.primaries.store.size_in_bytes" in kwargs["filter_path"]
+
+    def test_get_index_stats_pattern(self, test_client, mock_os):
         """Test index stats with wildcard pattern"""
-        mock_client = MagicMock()
-        mock_client.indices.stats.return_value = {
-            "indices": {
-                "logs-2026-02-04": {
-                    "total": {"docs": {"count": 1000, "deleted": 0}, "store": {"size_in_bytes": 1048576}},
-                    "primaries": {"docs": {"count": 1000}, "store": {"size_in_bytes": 524288}}
-                },
-                "logs-2026-02-03": {
-                    "total": {"docs": {"count": 800, "deleted": 0}, "store": {"size_in_bytes": 838860}},
-                    "primaries": {"docs": {"count": 800}, "store": {"size_in_bytes": 419430}}
-                }
-            }
-        }
-        mock_get_os.return_value = mock_client
+        mock_os.indices.stats.return_value = _STATS_PATTERN_RESPONSE
 
         response = test_client.get("/api/v1/indices/logs-*/stats")
 
@@ -55,28 +97,12 @@ class TestIndexStats:
         data = response.json()
         assert len(data["data"]) == 2
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_stats_not_found(self, mock_get_os, test_client):
-        """Test index stats for non-existent index"""
-        mock_client = MagicMock()
-        mock_client.indices.stats.side_effect = os_exceptions.NotFoundError(
-            404, "index_not_found_exception", {}
-        )
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get("/api/v1/indices/nonexistent-index/stats")
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-
 
 class TestIndexMappings:
     """Test index mappings endpoint"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_mappings(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_get_index_mappings(self, test_client):
         """Test GET /indices/{name}/mappings"""
-        mock_get_os.return_value = mock_opensearch_client
-
         response = test_client.get("/api/v1/indices/logs-2026-02-04/mappings")
 
         assert response.status_code == status.HTTP_200_OK
@@ -84,39 +110,21 @@ class TestIndexMappings:
         assert data["status"] == "success"
         assert "logs-2026-02-04" in data["data"]
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_mappings_not_found(self, mock_get_os, test_client):
-        """Test mappings for non-existent index"""
-        mock_client = MagicMock()
-        mock_client.indices.get_mapping.side_effect = os_exceptions.NotFoundError(
-            404, "index_not_found_exception", {}
-        )
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get("/api/v1/indices/nonexistent/mappings")
+    def test_get_index_mappings_cached(self, test_client, mock_os):
+        """Test repeated mappings requests are served from the cache"""
+        first = test_client.get("/api/v1/indices/logs-2026-02-04/mappings")
+        second = test_client.get("/api/v1/indices/logs-2026-02-04/mappings")
 
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert second.json() == first.json()
+        assert mock_os.indices.get_mapping.await_count == 1
 
 
 class TestIndexSettings:
     """Test index settings endpoint"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_settings(self, mock_get_os, test_client):
+    def test_get_index_settings(self, test_client, mock_os):
         """Test GET /indices/{name}/settings"""
-        mock_client = MagicMock()
-        mock_client.indices.get_settings.return_value = {
-            "logs-2026-02-04": {
-                "settings": {
-                    "index": {
-                        "number_of_shards": "3",
-                        "number_of_replicas": "1",
-                        "refresh_interval": "1s"
-                    }
-                }
-            }
-        }
-        mock_get_os.return_value = mock_client
+        mock_os.indices.get_settings.return_value = _SETTINGS_RESPONSE
 
         response = test_client.get("/api/v1/indices/logs-2026-02-04/settings")
 
@@ -125,30 +133,12 @@ class TestIndexSettings:
         assert data["status"] == "success"
         assert "logs-2026-02-04" in data["data"]
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_get_index_settings_not_found(self, mock_get_os, test_client):
-        """Test settings for non-existent index"""
-        mock_client = MagicMock()
-        mock_client.indices.get_settings.side_effect = os_exceptions.NotFoundError(
-            404, "index_not_found_exception", {}
-        )
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get("/api/v1/indices/nonexistent/settings")
-
-        assert response.status_code == status.HTTP_404_NOT_FOUND
-
 
 class TestDeleteIndex:
     """Test index deletion endpoint"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_delete_index_success(self, mock_get_os, test_client):
+    def test_delete_index_success(self, test_client):
         """Test DELETE /indices/{name} successful deletion"""
-        mock_client = MagicMock()
-        mock_client.indices.delete.return_value = {"acknowledged": True}
-        mock_get_os.return_value = mock_client
-
         response = test_client.delete("/api/v1/indices/test-index-to-delete")
 
         assert response.status_code == status.HTTP_200_OK
@@ -156,12 +146,16 @@ class TestDeleteIndex:
         assert data["status"] == "success"
         assert "deleted successfully" in data["message"]
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_delete_index_wildcards_rejected(self, mock_get_os, test_client):
-        """Test deletion rejects wildcard patterns for safety"""
-        mock_client = MagicMock()
-        mock_get_os.return_value = mock_client
+    def test_delete_index_invalidates_metadata_cache(self, test_client, mock_os):
+        """Test deleting an index drops cached mappings"""
+        test_client.get("/api/v1/indices/logs-*/mappings")
+        test_client.delete("/api/v1/indices/logs-2026-02-04")
+        test_client.get("/api/v1/indices/logs-*/mappings")
+
+        assert mock_os.indices.get_mapping.await_count == 2
 
+    def test_delete_index_wildcards_rejected(self, test_client, mock_os):
+        """Test deletion rejects wildcard patterns for safety"""
         # Test with asterisk
         response = test_client.delete("/api/v1/indices/logs-*")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -171,31 +165,19 @@ class TestDeleteIndex:
         response = test_client.delete("/api/v1/indices/logs-%3F")
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-        # Ensure delete was never called
-        mock_client.indices.delete.assert_not_called()
-
-    @patch('app.routers.indices.get_opensearch')
-    def test_delete_index_not_found(self, mock_get_os, test_client):
-        """Test deletion of non-existent index"""
-        mock_client = MagicMock()
-        mock_client.indices.delete.side_effect = os_exceptions.NotFoundError(
-            404, "index_not_found_exception", {}
-        )
-        mock_get_os.return_value = mock_client
-
-        response = test_client.delete("/api/v1/indices/nonexistent-index")
+        # Test with a comma-separated index list
+        response = test_client.delete("/api/v1/indices/logs-a,logs-b")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-        assert response.status_code == status.HTTP_404_NOT_FOUND
+        # Ensure delete was never called
+        mock_os.indices.delete.assert_not_called()
 
 
 class TestListIndices:
     """Test list indices endpoint"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_list_all_indices(self, mock_get_os, test_client, mock_opensearch_client):
+    def test_list_all_indices(self, test_client):
         """Test GET /indices/ lists all indices"""
-        mock_get_os.return_value = mock_opensearch_client
-
         response = test_client.get("/api/v1/indices/")
 
         assert response.status_code == status.HTTP_200_OK
@@ -204,15 +186,9 @@ class TestListIndices:
         assert isinstance(data["data"], list)
         assert len(data["data"]) > 0
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_list_indices_with_pattern(self, mock_get_os, test_client):
+    def test_list_indices_with_pattern(self, test_client, mock_os):
         """Test listing indices with pattern filter"""
-        mock_client = MagicMock()
-        mock_client.cat.indices.return_value = [
-            {"index": "logs-2026-02-04", "health": "green", "status": "open", "docs.count": "1000"},
-            {"index": "logs-2026-02-03", "health": "green", "status": "open", "docs.count": "800"}
-        ]
-        mock_get_os.return_value = mock_client
+        mock_os.cat.indices.return_value = _CAT_INDICES_PATTERN_RESPONSE
 
         response = test_client.get("/api/v1/indices/", params={"pattern": "logs-*"})
 
@@ -221,67 +197,79 @@ class TestListIndices:
         assert len(data["data"]) == 2
         assert all("logs-" in idx["index"] for idx in data["data"])
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_list_indices_filter_by_health(self, mock_get_os, test_client):
-        """Test listing indices filtered by health status"""
-        mock_client = MagicMock()
-        mock_client.cat.indices.return_value = [
-            {"index": "logs-2026-02-04", "health": "green", "status": "open"},
-            {"index": "logs-2026-02-03", "health": "yellow", "status": "open"},
-            {"index": "logs-2026-02-02", "health": "green", "status": "open"}
-        ]
-        mock_get_os.return_value = mock_client
-
+    def test_list_indices_filter_by_health(self, test_client, mock_os):
+        """Test health filter is passed through to OpenSearch"""
         response = test_client.get("/api/v1/indices/", params={"health": "green"})
 
         assert response.status_code == status.HTTP_200_OK
         data = response.json()
-        # Should only return green indices (filtering happens in endpoint)
         assert all(idx["health"] == "green" for idx in data["data"])
+        assert mock_os.cat.indices.call_args.kwargs["health"] == "green"
+
+    def test_list_indices_invalid_health_rejected(self, test_client):
+        """Test unknown health values are rejected before reaching OpenSearch"""
+        response = test_client.get("/api/v1/indices/", params={"health": "purple"})
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_list_indices_sorted_by_name(self, mock_get_os, test_client):
-        """Test indices are sorted by name"""
-        mock_client = MagicMock()
-        mock_client.cat.indices.return_value = [
-            {"index": "logs-2026-02-03", "health": "green"},
-            {"index": "logs-2026-02-04", "health": "green"},
-            {"index": "logs-2026-02-02", "health": "green"}
-        ]
-        mock_get_os.return_value = mock_client
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
+    def test_list_indices_sorted_by_name(self, test_client, mock_os):
+        """Test indices are sorted by name and trimmed to the listed columns by OpenSearch"""
         response = test_client.get("/api/v1/indices/")
 
         assert response.status_code == status.HTTP_200_OK
-        data = response.json()
-        # Verify sorting
-        indices = [idx["index"] for idx in data["data"]]
-        assert indices == sorted(indices)
+        kwargs = mock_os.cat.indices.call_args.kwargs
+        assert kwargs["s"] == "index"
+        assert kwargs["h"] == "index,health,status,docs.count,store.size"
 
 
 class TestIndexEndpointsErrorHandling:
     """Test error handling across index endpoints"""
 
-    @patch('app.routers.indices.get_opensearch')
-    def test_opensearch_connection_error(self, mock_get_os, test_client):
-        """Test handling of OpenSearch connection errors"""
-        mock_client = MagicMock()
-        mock_client.indices.stats.side_effect = os_exceptions.ConnectionError(
-            "N/A", "Connection refused", None
-        )
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get("/api/v1/indices/logs-*/stats")
-
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-
-    @patch('app.routers.indices.get_opensearch')
-    def test_generic_exception_handling(self, mock_get_os, test_client):
-        """Test handling of unexpected exceptions"""
-        mock_client = MagicMock()
-        mock_client.indices.stats.side_effect = Exception("Unexpected error")
-        mock_get_os.return_value = mock_client
-
-        response = test_client.get("/api/v1/indices/logs-2026-02-04/stats")
-
-        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    @pytest.mark.parametrize("os_method, http_verb, url, side_effect, expected_status", [
+        pytest.param(
+            "indices.stats", "get", "/api/v1/indices/nonexistent-index/stats",
+            _NOT_FOUND,
+            status.HTTP_404_NOT_FOUND,
+            id="stats_not_found",
+        ),
+        pytest.param(
+            "indices.get_mapping", "get", "/api/v1/indices/nonexistent/mappings",
+            _NOT_FOUND,
+            status.HTTP_404_NOT_FOUND,
+            id="mappings_not_found",
+        ),
+        pytest.param(
+            "indices.get_settings", "get", "/api/v1/indices/nonexistent/settings",
+            _NOT_FOUND,
+            status.HTTP_404_NOT_FOUND,
+            id="settings_not_found",
+        ),
+        pytest.param(
+            "indices.delete", "delete", "/api/v1/indices/nonexistent-index",
+            _NOT_FOUND,
+            status.HTTP_404_NOT_FOUND,
+            id="delete_not_found",
+        ),
+        pytest.param(
+            "indices.stats", "get", "/api/v1/indices/logs-*/stats",
+            _CONNECTION_ERROR,
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            id="connection_error",
+        ),
+        pytest.param(
+            "indices.stats", "get", "/api/v1/indices/logs-2026-02-04/stats",
+            Exception("Unexpected error"),
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            id="unexpected_error",
+        ),
+    ])
+    def test_opensearch_error(
+        self, os_method, http_verb, url, side_effect, expected_status,
+        test_client, mock_os
+    ):
+        """Test OpenSearch errors map to HTTP status codes on every endpoint"""
+        attrgetter(os_method)(mock_os).side_effect = side_effect
+
+        response = getattr(test_client, http_verb)(url)
+
+        assert response.status_code == expected_status
@@ -8,48 +8,54 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
-import pytest
-from fastapi.testclient import TestClient
-
-from app.main import app
+import asyncio
 
+import httpx
 
-@pytest.fixture(scope="function")
-def client():
-    """Create FastAPI test client."""
-    with TestClient(app) as c:
-        yield c
+from app.config import settings
+from app.main import app
 
 
 class TestMetricsEndpoint:
     """Tests for the /metrics Prometheus endpoint."""
 
-    def test_metrics_returns_200(self, client):
+    def test_metrics_returns_200(self, test_client):
         """GET /metrics returns 200 OK."""
-        response = client.get("/metrics")
+        response = test_client.get("/metrics")
         assert response.status_code == 200
 
-    def test_metrics_returns_prometheus_format(self, client):
+    def test_metrics_returns_prometheus_format(self, test_client):
         """GET /metrics returns Prometheus text format content type."""
-        response = client.get("/metrics")
+        response = test_client.get("/metrics")
         content_type = response.headers.get("content-type", "")
         assert "text/plain" in content_type or "text/openmetrics" in content_type
 
-    def test_metrics_contains_http_request_metrics(self, client):
+    def test_metrics_contains_http_request_metrics(self, test_client):
         """Metrics include HTTP request metrics after making a request."""
         # Generate some metrics by hitting an endpoint
-        client.get("/health/liveness")
-        response = client.get("/metrics")
+        test_client.get("/health/liveness")
+        response = test_client.get("/metrics")
         assert "http_request" in response.text
 
-    def test_metrics_not_in_openapi_schema(self, client):
+    def test_metrics_not_in_openapi_schema(self, test_client):
         """The /metrics endpoint should not appear in OpenAPI schema."""
-        response = client.get("/openapi.json")
+        response = test_client.get("/openapi.json")
         schema = response.json()
         assert "/metrics" not in schema.get("paths", {})
 
-    def test_metrics_not_rate_limited(self, client):
+    def test_metrics_not_rate_limited(self, monkeypatch):
         """The /metrics endpoint should not be rate limited."""
-        for _ in range(50):
-            response = client.get("/metrics")
+        # At a limit of 1, the second scrape would be rejected if counted
+        monkeypatch.setattr(settings, "rate_limit_enabled", True)
+        monkeypatch.setattr(settings, "rate_limit_per_minute", 1)
+
+        async def scrape_concurrently():
+            # In-process ASGI calls on one loop, issued together rather than
+            # one at a time through TestClient's portal thread
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+                return await asyncio.gather(*(client.get("/metrics") for _ in range(3)))
+
+        for response in asyncio.run(scrape_concurrently()):
             assert response.status_code == 200
+            assert "X-RateLimit-Limit" not in response.headers
@@ -23,6 +23,24 @@ from app.models.search import (
     AggregationResponse
 )
 
+# The models set defer_build, so each validator is otherwise built inside
+# whichever test first constructs that model. Build them once at import so
+# per-test durations measure validation alone.
+for _model in (
+    APIResponse,
+    APIResponse[dict],
+    PaginationParams,
+    PaginationMeta,
+    TimeRange,
+    HealthResponse,
+    OpenSearchHealthResponse,
+    SearchRequest,
+    SearchResponse,
+    AggregationRequest,
+    AggregationResponse,
+):
+    _model.model_rebuild()
+
 
 # ============================================================================
 # Common Models Tests
@@ -31,23 +49,16 @@ from app.models.search import (
 class TestAPIResponse:
     """Test APIResponse model"""
 
-    def test_api_response_success(self):
-        """Test successful API response creation"""
-        response = APIResponse(
-            status="success",
-            data={"key": "value"},
-            message="Operation completed"
-        )
+    @pytest.mark.parametrize("data, message", [
+        pytest.param({"key": "value"}, "Operation completed", id="with_message"),
+        pytest.param({}, None, id="minimal"),
+    ])
+    def test_api_response_creation(self, data, message):
+        """Test API response creation, with and without the optional message"""
+        response = APIResponse[dict](status="success", data=data, message=message)
         assert response.status == "success"
-        assert response.data == {"key": "value"}
-        assert response.message == "Operation completed"
-
-    def test_api_response_minimal(self):
-        """Test API response with minimal fields"""
-        response = APIResponse[dict](status="success", data={})
-        assert response.status == "success"
-        assert response.data == {}
-        assert response.message is None
+        assert response.data == data
+        assert response.message == message
 
     def test_api_response_serialization(self):
         """Test API response JSON serialization"""
@@ -60,32 +71,26 @@ class TestAPIResponse:
 class TestPaginationParams:
     """Test PaginationParams model"""
 
-    def test_pagination_defaults(self):
-        """Test default pagination values"""
-        params = PaginationParams()
-        assert params.page == 1
-        assert params.size == 100
-        assert params.offset == 0
-
-    def test_pagination_offset_calculation(self):
-        """Test offset calculation from page and size"""
-        params = PaginationParams(page=3, size=50)
-        assert params.offset == 100  # (3-1) * 50
-
-    def test_pagination_validation_page_minimum(self):
-        """Test page number must be >= 1"""
+    @pytest.mark.parametrize("kwargs, page, size, offset", [
+        pytest.param({}, 1, 100, 0, id="defaults"),
+        pytest.param({"page": 3, "size": 50}, 3, 50, 100, id="offset"),  # (3-1) * 50
+    ])
+    def test_pagination_values(self, kwargs, page, size, offset):
+        """Test default pagination values and offset calculation"""
+        params = PaginationParams(**kwargs)
+        assert params.page == page
+        assert params.size == size
+        assert params.offset == offset
+
+    @pytest.mark.parametrize("kwargs", [
+        pytest.param({"page": 0}, id="page_minimum"),  # page must be >= 1
+        pytest.param({"size": 0}, id="size_minimum"),  # size must be >= 1
+        pytest.param({"size": 10001}, id="size_maximum"),  # size must be <= 10000
+    ])
+    def test_pagination_validation(self, kwargs):
+        """Test out-of-range page and size are rejected"""
         with pytest.raises(ValidationError):
-            PaginationParams(page=0)
-
-    def test_pagination_validation_size_minimum(self):
-        """Test size must be >= 1"""
-        with pytest.raises(ValidationError):
-            PaginationParams(size=0)
-
-    def test_pagination_validation_size_maximum(self):
-        """Test size must be <= 10000"""
-        with pytest.raises(ValidationError):
-            PaginationParams(size=10001)
+            PaginationParams(**kwargs)
 
 
 class TestPaginationMeta:
@@ -212,6 +217,14 @@ class TestSearchRequest:
         assert request.indices == ["logs-*"]
         assert request.size == 100
         assert request.from_ == 0
+        assert request.track_total_hits is None
+
+    def test_search_request_track_total_hits(self):
+        """Test track_total_hits accepts booleans and non-negative counts"""
+        assert SearchRequest(track_total_hits=False).track_total_hits is False
+        assert SearchRequest(track_total_hits=500).track_total_hits == 500
+        with pytest.raises(ValidationError):
+            SearchRequest(track_total_hits=-1)
 
     def test_search_request_full(self):
         """Test search request with all fields"""
@@ -228,6 +241,11 @@ class TestSearchRequest:
         assert request.size == 50
         assert request.from_ == 10
 
+    def test_search_request_rejects_field_name_offset(self):
+        """Test "from_" is rejected rather than silently ignored"""
+        with pytest.raises(ValidationError, match='Use "from"'):
+            SearchRequest(**{"from_": 10})
+
     def test_search_request_validation_size(self):
         """Test search request size validation"""
         with pytest.raises(ValidationError):
@@ -285,39 +303,23 @@ class TestSearchResponse:
 class TestAggregationRequest:
     """Test AggregationRequest model"""
 
-    def test_aggregation_request_terms(self):
-        """Test terms aggregation request"""
-        request = AggregationRequest(
-            query="level:ERROR",
-            indices=["logs-*"],
-            agg_type="terms",
-            field="service",
-            size=10
-        )
-        assert request.agg_type == "terms"
-        assert request.field == "service"
-        assert request.size == 10
-
-    def test_aggregation_request_date_histogram(self):
-        """Test date_histogram aggregation request"""
-        request = AggregationRequest(
-            indices=["logs-*"],
-            agg_type="date_histogram",
-            field="@timestamp",
-            interval="1h"
-        )
-        assert request.agg_type == "date_histogram"
-        assert request.interval == "1h"
-
-    def test_aggregation_request_with_time_range(self):
-        """Test aggregation request with time range"""
-        request = AggregationRequest(
-            indices=["logs-*"],
-            agg_type="stats",
-            field="duration_ms",
-            time_range=TimeRange(field="@timestamp", start="now-1d")
-        )
-        assert request.time_range.start == "now-1d"
+    def test_aggregation_request_variants(self):
+        """Test terms, date_histogram and time-ranged stats requests keep their fields"""
+        cases = [
+            dict(query="level:ERROR", indices=["logs-*"], agg_type="terms", field="service", size=10),
+            dict(indices=["logs-*"], agg_type="date_histogram", field="@timestamp", interval="1h"),
+            dict(
+                indices=["logs-*"],
+                agg_type="stats",
+                field="duration_ms",
+                time_range=TimeRange(field="@timestamp", start="now-1d")
+            ),
+        ]
+        # One node for all combinations; the failing case shows in the assert message
+        for kwargs in cases:
+            request = AggregationRequest(**kwargs)
+            for name, value in kwargs.items():
+                assert getattr(request, name) == value, kwargs
 
 
 class TestAggregationBucket:
@@ -0,0 +1,88 @@
+"""
+Bulk Indexing Helpers
+
+NDJSON encoding and concurrent _bulk posting shared by the sample and
+Vaultize log generators.
+
+Authors: Balaji Rajan and Claude (Anthropic)
+License: Apache 2.0
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+import requests
+
+# Documents per _bulk request and requests in flight
+BULK_CHUNK_SIZE = 500
+BULK_WORKERS = 4
+
+# Bulk documents without the default ", " / ": " padding
+_dumps_compact = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def bulk_body(docs: List[Dict[str, Any]], index_name: str) -> str:
+    """
+    Build the NDJSON body of a _bulk request indexing docs into index_name.
+
+    The action line is the same for every document, so it is serialized
+    once; documents are serialized compactly and joined in a single pass.
+
+    Args:
+        docs: Documents to index
+        index_name: Target index
+
+    Returns:
+        str: Newline-terminated NDJSON body
+    """
+    action_line = _dumps_compact({"index": {"_index": index_name}}) + "\n"
+    return "".join([action_line + _dumps_compact(doc) + "\n" for doc in docs])
+
+
+def post_bulk(
+    base_url: str,
+    docs: List[Dict[str, Any]],
+    index_name: str,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    workers: int = BULK_WORKERS,
+) -> List[requests.Response]:
+    """
+    Index docs through _bulk in fixed-size chunks, a few requests at a time.
+
+    Only the in-flight chunks are held in memory as request bodies. Each
+    worker thread keeps its own keep-alive requests.Session, since requests
+    does not promise that one Session is safe to share across threads.
+
+    Args:
+        base_url: OpenSearch URL
+        docs: Documents to index
+        index_name: Target index
+        chunk_size: Documents per _bulk request
+        workers: Requests in flight
+
+    Returns:
+        list: One response per chunk, in chunk order
+    """
+    local = threading.local()
+    sessions: List[requests.Session] = []
+
+    def post_chunk(chunk: List[Dict[str, Any]]) -> requests.Response:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = local.session = requests.Session()
+            sessions.append(session)
+        return session.post(
+            f"{base_url}/_bulk",
+            data=bulk_body(chunk, index_name),
+            headers={"Content-Type": "application/x-ndjson"}
+        )
+
+    chunks = [docs[i:i + chunk_size] for i in range(0, len(docs), chunk_size)]
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(post_chunk, chunks))
+    finally:
+        for session in sessions:
+            session.close()
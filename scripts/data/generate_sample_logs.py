@@ -9,13 +9,15 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
-import json
 import random
 import sys
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Set, Tuple
 import requests
 
+from _bulk import post_bulk
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -23,6 +25,12 @@ import requests
 OPENSEARCH_URL = "http://localhost:9200"
 INDEX_PREFIX = "logs"
 
+# Keep-alive session for the main thread's calls; bulk workers use their own
+session = requests.Session()
+
+# Indices already checked or created by this process
+_known_indices: Set[str] = set()
+
 # Sample data pools
 SERVICES = ["api-service", "web-service", "db-service", "cache-service", "auth-service"]
 LOG_LEVELS = ["DEBUG", "INFO", "WARN", "ERROR", "FATAL"]
@@ -54,31 +62,58 @@ HOSTS = ["server-01", "server-02", "server-03", "server-04", "server-05"]
 USERS = ["user1", "user2", "user3", "admin", "service-account"]
 ENVIRONMENTS = ["development", "staging", "production"]
 
+# Every (level, message, is_error) combination, weighted so each level stays
+# equally likely and each message is uniform within its level's pool. One
+# draw picks both the level and a matching message.
+ERROR_LEVELS = frozenset({"ERROR", "FATAL"})
+LEVEL_MESSAGES: Tuple[Tuple[str, str, bool], ...] = tuple(
+    (level, message, level in ERROR_LEVELS)
+    for level in LOG_LEVELS
+    for message in (ERROR_MESSAGES if level in ERROR_LEVELS else INFO_MESSAGES)
+)
+LEVEL_MESSAGE_CUM_WEIGHTS = tuple(accumulate(
+    1 / len(ERROR_MESSAGES if is_error else INFO_MESSAGES)
+    for _, _, is_error in LEVEL_MESSAGES
+))
+
 # ============================================================================
 # Log Generation
 # ============================================================================
 
-def generate_log_entry(timestamp: datetime) -> Dict[str, Any]:
+def draw_level_messages(count: int) -> List[Tuple[str, str, bool]]:
+    """
+    Draw (level, message, is_error) combinations for count log entries.
+
+    Args:
+        count: Number of combinations to draw
+
+    Returns:
+        list: Entries of LEVEL_MESSAGES
+    """
+    return random.choices(LEVEL_MESSAGES, cum_weights=LEVEL_MESSAGE_CUM_WEIGHTS, k=count)
+
+
+def generate_log_entry(
+    timestamp: datetime,
+    level_message: Optional[Tuple[str, str, bool]] = None
+) -> Dict[str, Any]:
     """
     Generate a single log entry with realistic data.
 
     Args:
         timestamp: Log timestamp
+        level_message: Pre-drawn (level, message, is_error); drawn here if omitted
 
     Returns:
         dict: Log entry
     """
-    level = random.choice(LOG_LEVELS)
+    level, message, is_error = level_message or draw_level_messages(1)[0]
     service = random.choice(SERVICES)
 
-    # Weight error messages towards ERROR/FATAL levels
-    if level in ["ERROR", "FATAL"]:
-        message = random.choice(ERROR_MESSAGES)
-    else:
-        message = random.choice(INFO_MESSAGES)
-
     log_entry = {
-        "@timestamp": timestamp.isoformat() + "Z",
+        # Whole seconds: the microseconds add nothing to sample data, and
+        # queries over it should round their bounds too (now-24h/h)
+        "@timestamp": timestamp.replace(microsecond=0).isoformat() + "Z",
         "level": level,
         "service": service,
         "message": message,
@@ -91,7 +126,7 @@ def generate_log_entry(timestamp: datetime) -> Dict[str, Any]:
     }
 
     # Add extra fields for errors
-    if level in ["ERROR", "FATAL"]:
+    if is_error:
         log_entry["stack_trace"] = f"Error at {service}.handler.process()"
         log_entry["error_code"] = f"ERR_{random.randint(1000, 9999)}"
 
@@ -109,20 +144,19 @@ def generate_logs(count: int, time_range_hours: int = 24) -> List[Dict[str, Any]
     Returns:
         list: List of log entries
     """
-    logs = []
     now = datetime.utcnow()
     start_time = now - timedelta(hours=time_range_hours)
 
-    for i in range(count):
-        # Distribute logs across the time range
-        random_offset = random.uniform(0, time_range_hours * 3600)
-        timestamp = start_time + timedelta(seconds=random_offset)
-        logs.append(generate_log_entry(timestamp))
-
-    # Sort by timestamp
-    logs.sort(key=lambda x: x["@timestamp"])
+    # Distribute logs across the time range. Sorting the float offsets up
+    # front yields entries already in time order, instead of sorting the
+    # finished entries by their timestamp strings.
+    time_range_seconds = time_range_hours * 3600
+    offsets = sorted([random.uniform(0, time_range_seconds) for _ in range(count)])
 
-    return logs
+    return [
+        generate_log_entry(start_time + timedelta(seconds=offset), level_message)
+        for offset, level_message in zip(offsets, draw_level_messages(count))
+    ]
 
 
 # ============================================================================
@@ -133,11 +167,17 @@ def create_index_if_not_exists(index_name: str):
     """
     Create OpenSearch index if it doesn't exist.
 
+    Indices confirmed or created earlier in the process are skipped
+    without a request.
+
     Args:
         index_name: Name of the index
     """
+    if index_name in _known_indices:
+        return
+
     # Check if index exists
-    response = requests.head(f"{OPENSEARCH_URL}/{index_name}")
+    response = session.head(f"{OPENSEARCH_URL}/{index_name}")
 
     if response.status_code == 404:
         # Create index with mapping
@@ -160,7 +200,7 @@ def create_index_if_not_exists(index_name: str):
             }
         }
 
-        response = requests.put(
+        response = session.put(
             f"{OPENSEARCH_URL}/{index_name}",
             json=mapping,
             headers={"Content-Type": "application/json"}
@@ -171,8 +211,15 @@ def create_index_if_not_exists(index_name: str):
         else:
             print(f"[ERROR] Failed to create index: {response.text}")
             sys.exit(1)
-    else:
+    elif response.status_code == 200:
         print(f"[OK] Index already exists: {index_name}")
+    else:
+        # Anything else (e.g. a 5xx) says nothing about the index; fail
+        # rather than remember it as present
+        print(f"[ERROR] Failed to check index {index_name}: HTTP {response.status_code}")
+        sys.exit(1)
+
+    _known_indices.add(index_name)
 
 
 def index_logs(logs: List[Dict[str, Any]], index_name: str):
@@ -183,33 +230,21 @@ def index_logs(logs: List[Dict[str, Any]], index_name: str):
         logs: List of log entries
         index_name: Index name
     """
-    # Build bulk request body
-    bulk_body = []
-    for log in logs:
-        # Action line
-        bulk_body.append(json.dumps({"index": {"_index": index_name}}))
-        # Document line
-        bulk_body.append(json.dumps(log))
-
-    bulk_data = "\n".join(bulk_body) + "\n"
-
-    # Send bulk request
-    response = requests.post(
-        f"{OPENSEARCH_URL}/_bulk",
-        data=bulk_data,
-        headers={"Content-Type": "application/x-ndjson"}
-    )
-
-    if response.status_code == 200:
+    responses = post_bulk(OPENSEARCH_URL, logs, index_name)
+
+    error_count = 0
+    for response in responses:
+        if response.status_code != 200:
+            print(f"[ERROR] Bulk indexing failed: {response.text}")
+            sys.exit(1)
         result = response.json()
         if result.get("errors"):
-            error_count = sum(1 for item in result["items"] if "error" in item.get("index", {}))
-            print(f"[ERROR] Indexed with errors: {error_count} errors out of {len(logs)} documents")
-        else:
-            print(f"[OK] Successfully indexed {len(logs)} log entries")
+            error_count += sum(1 for item in result["items"] if "error" in item.get("index", {}))
+
+    if error_count:
+        print(f"[ERROR] Indexed with errors: {error_count} errors out of {len(logs)} documents")
     else:
-        print(f"[ERROR] Bulk indexing failed: {response.text}")
-        sys.exit(1)
+        print(f"[OK] Successfully indexed {len(logs)} log entries")
 
 
 # ============================================================================
@@ -240,7 +275,7 @@ def main():
 
     # Check OpenSearch connection
     try:
-        response = requests.get(OPENSEARCH_URL)
+        response = session.get(OPENSEARCH_URL)
         if response.status_code == 200:
             info = response.json()
             print(f"[OK] Connected to OpenSearch {info['version']['number']}")
@@ -9,13 +9,14 @@ Authors: Balaji Rajan and Claude (Anthropic)
 License: Apache 2.0
 """
 
-import json
 import random
 import sys
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Any
 import requests
 
+from _bulk import post_bulk
+
 # ============================================================================
 # Configuration
 # ============================================================================
@@ -25,6 +26,9 @@ INDEX_PREFIX = "logs"
 NUM_LOGS = 5000
 TIME_RANGE_HOURS = 72  # 3 days of data
 
+# Keep-alive session for the main thread's calls; bulk workers use their own
+session = requests.Session()
+
 # ============================================================================
 # Vaultize Domain Data
 # ============================================================================
@@ -499,7 +503,7 @@ def generate_log_entry(timestamp: datetime) -> Dict[str, Any]:
     message = generator(level, user)
 
     log_entry = {
-        "@timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.") + f"{random.randint(0,999):03d}Z",
+        "@timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.") + f"{timestamp.microsecond // 1000:03d}Z",
         "level": level,
         "service": service,
         "message": message,
@@ -525,7 +529,7 @@ def generate_log_entry(timestamp: datetime) -> Dict[str, Any]:
 
 
 def generate_logs(count: int, time_range_hours: int) -> List[Dict[str, Any]]:
-    logs = []
+    timestamps = []
     now = datetime.now(timezone.utc)
     start_time = now - timedelta(hours=time_range_hours)
 
@@ -538,18 +542,19 @@ def generate_logs(count: int, time_range_hours: int) -> List[Dict[str, Any]]:
         hour = timestamp.hour
         if 9 <= hour <= 18:
             # Business hours - keep this log
-            logs.append(generate_log_entry(timestamp))
+            timestamps.append(timestamp)
         elif random.random() < 0.3:
             # Off-hours - 30% chance to keep (background jobs, sync, etc.)
-            logs.append(generate_log_entry(timestamp))
+            timestamps.append(timestamp)
         else:
             # Generate another log during business hours instead
             biz_hour = random.randint(9, 18)
-            timestamp = timestamp.replace(hour=biz_hour, minute=random.randint(0, 59))
-            logs.append(generate_log_entry(timestamp))
+            timestamps.append(timestamp.replace(hour=biz_hour, minute=random.randint(0, 59)))
 
-    logs.sort(key=lambda x: x["@timestamp"])
-    return logs
+    # Sort the datetimes, not the finished entries by timestamp string, so
+    # the logs are built already in time order
+    timestamps.sort()
+    return [generate_log_entry(timestamp) for timestamp in timestamps]
 
 
 # ============================================================================
@@ -557,7 +562,7 @@ def generate_logs(count: int, time_range_hours: int) -> List[Dict[str, Any]]:
 # ============================================================================
 
 def create_index(index_name: str):
-    response = requests.head(f"{OPENSEARCH_URL}/{index_name}")
+    response = session.head(f"{OPENSEARCH_URL}/{index_name}")
     if response.status_code == 404:
         mapping = {
             "settings": {
@@ -583,8 +588,8 @@ def create_index(index_name: str):
                 }
             }
         }
-        resp = requests.put(f"{OPENSEARCH_URL}/{index_name}", json=mapping,
-                          headers={"Content-Type": "application/json"})
+        resp = session.put(f"{OPENSEARCH_URL}/{index_name}", json=mapping,
+                           headers={"Content-Type": "application/json"})
         if resp.status_code in [200, 201]:
             print(f"  [OK] Created index: {index_name}")
         else:
@@ -595,29 +600,21 @@ def create_index(index_name: str):
 
 
 def index_logs(logs: List[Dict[str, Any]], index_name: str):
-    bulk_body = []
-    for log in logs:
-        bulk_body.append(json.dumps({"index": {"_index": index_name}}))
-        bulk_body.append(json.dumps(log))
-
-    bulk_data = "\n".join(bulk_body) + "\n"
-
-    response = requests.post(
-        f"{OPENSEARCH_URL}/_bulk",
-        data=bulk_data,
-        headers={"Content-Type": "application/x-ndjson"}
-    )
+    responses = post_bulk(OPENSEARCH_URL, logs, index_name)
 
-    if response.status_code == 200:
+    error_count = 0
+    for response in responses:
+        if response.status_code != 200:
+            print(f"  [ERROR] Bulk indexing failed: {response.text}")
+            sys.exit(1)
         result = response.json()
         if result.get("errors"):
-            error_count = sum(1 for item in result["items"] if "error" in item.get("index", {}))
-            print(f"  [WARN] {error_count} errors out of {len(logs)} documents")
-        else:
-            print(f"  [OK] Indexed {len(logs)} documents")
+            error_count += sum(1 for item in result["items"] if "error" in item.get("index", {}))
+
+    if error_count:
+        print(f"  [WARN] {error_count} errors out of {len(logs)} documents")
     else:
-        print(f"  [ERROR] Bulk indexing failed: {response.text}")
-        sys.exit(1)
+        print(f"  [OK] Indexed {len(logs)} documents")
 
 
 # ============================================================================
@@ -638,7 +635,7 @@ def main():
 
     # Check connection
     try:
-        resp = requests.get(OPENSEARCH_URL)
+        resp = session.get(OPENSEARCH_URL)
         info = resp.json()
         print(f"  [OK] Connected to OpenSearch {info['version']['number']}")
     except Exception as e:
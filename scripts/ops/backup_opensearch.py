@@ -35,34 +35,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# One keep-alive session shared by the repository and snapshot calls
+session = requests.Session()
+
 
 # ============================================================================
 # Repository Management
 # ============================================================================
 
-def ensure_repository(base_url: str, auth: tuple | None = None) -> bool:
-    """Ensure the snapshot repository exists, creating it if needed."""
+def ensure_repository(
+    base_url: str,
+    auth: tuple | None = None,
+    max_snapshot_bytes_per_sec: str | None = None,
+) -> bool:
+    """
+    Ensure the snapshot repository exists, creating it if needed.
+
+    max_snapshot_bytes_per_sec (e.g. "200mb") raises OpenSearch's per-node
+    snapshot throttle, 40mb by default. When given, an existing repository
+    is re-registered with its current type and settings plus the throttle,
+    so the new rate applies.
+    """
     url = f"{base_url}/_snapshot/{REPO_NAME}"
-    resp = requests.get(url, auth=auth, timeout=10)
+    resp = session.get(url, auth=auth, timeout=10)
 
     if resp.status_code == 200:
-        logger.info(f"Repository '{REPO_NAME}' already exists")
-        return True
-
-    logger.info(f"Creating snapshot repository '{REPO_NAME}'...")
-    body = {
-        "type": "fs",
-        "settings": {
-            "location": REPO_PATH,
-            "compress": True,
-        },
-    }
-    resp = requests.put(url, json=body, auth=auth, timeout=10)
+        if not max_snapshot_bytes_per_sec:
+            logger.info(f"Repository '{REPO_NAME}' already exists")
+            return True
+        logger.info(
+            f"Updating repository '{REPO_NAME}' with "
+            f"max_snapshot_bytes_per_sec={max_snapshot_bytes_per_sec}..."
+        )
+        body = resp.json()[REPO_NAME]
+    else:
+        logger.info(f"Creating snapshot repository '{REPO_NAME}'...")
+        body = {
+            "type": "fs",
+            "settings": {
+                "location": REPO_PATH,
+                "compress": True,
+            },
+        }
+    if max_snapshot_bytes_per_sec:
+        body["settings"]["max_snapshot_bytes_per_sec"] = max_snapshot_bytes_per_sec
+    resp = session.put(url, json=body, auth=auth, timeout=10)
     if resp.status_code == 200:
-        logger.info("Repository created successfully")
+        logger.info("Repository registered successfully")
         return True
 
-    logger.error(f"Failed to create repository: {resp.status_code} {resp.text}")
+    logger.error(f"Failed to register repository: {resp.status_code} {resp.text}")
     return False
 
 
@@ -83,7 +105,7 @@ def create_snapshot(base_url: str, auth: tuple | None = None) -> str | None:
         "include_global_state": False,
     }
 
-    resp = requests.put(url, json=body, auth=auth, timeout=300)
+    resp = session.put(url, json=body, auth=auth, timeout=300)
     if resp.status_code == 200:
         data = resp.json()
         snapshot = data.get("snapshot", {})
@@ -104,7 +126,7 @@ def create_snapshot(base_url: str, auth: tuple | None = None) -> str | None:
 def list_snapshots(base_url: str, auth: tuple | None = None) -> list:
     """List all snapshots in the repository."""
     url = f"{base_url}/_snapshot/{REPO_NAME}/_all"
-    resp = requests.get(url, auth=auth, timeout=10)
+    resp = session.get(url, auth=auth, timeout=10)
 
     if resp.status_code == 200:
         snapshots = resp.json().get("snapshots", [])
@@ -127,7 +149,7 @@ def list_snapshots(base_url: str, auth: tuple | None = None) -> list:
 def verify_snapshot(base_url: str, snapshot_name: str, auth: tuple | None = None) -> bool:
     """Verify a snapshot's integrity."""
     url = f"{base_url}/_snapshot/{REPO_NAME}/{snapshot_name}/_status"
-    resp = requests.get(url, auth=auth, timeout=30)
+    resp = session.get(url, auth=auth, timeout=30)
 
     if resp.status_code == 200:
         data = resp.json()
@@ -151,11 +173,19 @@ def main():
     parser.add_argument("--password", default=None, help="Password for auth")
     parser.add_argument("--list", action="store_true", help="List all snapshots")
     parser.add_argument("--verify", type=str, help="Verify a specific snapshot")
+    parser.add_argument(
+        "--max-snapshot-rate",
+        default=None,
+        help=(
+            "Snapshot throttle, e.g. 200mb (OpenSearch default: 40mb); "
+            "re-registers an existing repository to apply it"
+        ),
+    )
 
     args = parser.parse_args()
     auth = (args.user, args.password) if args.user else None
 
-    if not ensure_repository(args.url, auth):
+    if not ensure_repository(args.url, auth, args.max_snapshot_rate):
         sys.exit(1)
 
     if args.list: